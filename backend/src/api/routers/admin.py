@@ -1,5 +1,5 @@
 import uuid
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
 from pydantic import BaseModel, validator
 from typing import Optional, List, Union
 from src.api.services.config_manager import load_config, save_config
@@ -7,7 +7,13 @@ from src.api.services.scraper_runner import run_general_scraping, run_product_sc
 from src.api.services import db_service, neo4j_service
 from src.api.deps import get_current_user, get_current_admin
 from src.api.schemas import ProductCreate, ProductUpdate, ProductOut, OrderOut, OrderStatusUpdate, CustomerOut
-from src.api.services.semantic_cache import clear_semantic_cache
+from src.api.services.semantic_cache import clear_semantic_cache, get_semantic_cache_stats
+from src.api.services.cache_warmup import load_warmup_questions, parse_questions, run_cache_warmup_job
+from src.api.services.retrieval_cache import retrieval_cache
+from src.api.services.relevance import get_relevance_stats
+from src.api.services.cypher_cache import cypher_cache
+from src.api.services.cypher_templates import get_template_stats
+from src.api.services.job_runner import job_runner, JobConflict, JobNotCancellable
 
 # IMPORT LOGGER
 from src.utils.logging_config import get_logger
@@ -54,6 +60,16 @@ async def admin_status():
             "/admin/ingest-chroma (POST)",
             "/admin/clear-chroma (DELETE)",
             "/admin/ingest-neo4j (POST)",
+            "/admin/clear-neo4j (DELETE)",
+            "/admin/jobs (GET)",
+            "/admin/jobs/{job_id} (GET)",
+            "/admin/jobs/{job_id}/cancel (POST)",
+            "/admin/semantic-cache/stats (GET)",
+            "/admin/semantic-cache/warmup (POST)",
+            "/admin/retrieval-cache/stats (GET)",
+            "/admin/retrieval-relevance/stats (GET)",
+            "/admin/cypher-cache/stats (GET)",
+            "/admin/cypher-templates/stats (GET)",
             "/admin/status (GET)"
         ]
     }
@@ -119,72 +135,147 @@ async def scrape_products():
         raise HTTPException(status_code=500, detail=f"Product scraping failed: {str(e)}")
 
 # --- DATABASE ACTIONS ---
+# Ingestion and clearing run as background jobs: the request returns a job id
+# straight away and progress is polled from /admin/jobs/{job_id}.
 
-@router.post("/ingest-neo4j")
+def submit_job(kind: str, fn, message: str, group: Optional[str] = None) -> dict:
+    try:
+        job = job_runner.submit(kind, fn, group=group)
+    except JobConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"message": message, **job.to_dict()}
+
+def neo4j_ingestion_job() -> dict:
+    stats = neo4j_service.run_master_ingestion()
+    if "error" in stats:
+        raise RuntimeError(stats["error"])
+    clear_semantic_cache()
+    return stats
+
+def chroma_ingestion_job() -> dict:
+    items_added = db_service.run_chroma_ingestion()
+    clear_semantic_cache()
+    return {"items_added": items_added}
+
+def clear_neo4j_job() -> dict:
+    result = neo4j_service.run_clear_neo4j()
+    clear_semantic_cache()
+    return result
+
+@router.post("/ingest-neo4j", status_code=202)
 async def ingest_neo4j_data():
-    """Ingest the scraped products.csv into Neo4j."""
+    """Sync the scraped products.csv into SQL and Neo4j (background job)."""
     logger.info("--- Admin API: Received request to ingest Neo4j data ---")
-    try:
-        count = neo4j_service.run_neo4j_ingestion()
-        clear_semantic_cache()
-        return {
-            "message": "Neo4j ingestion successful.",
-            "processed_count": count
-        }
-    except Exception as e:
-        logger.error(f"Error during Neo4j ingestion: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
+    return submit_job("ingest-neo4j", neo4j_ingestion_job, "Neo4j ingestion started.", group="neo4j")
 
-@router.post("/ingest-chroma")
+@router.post("/ingest-chroma", status_code=202)
 async def ingest_chroma_data():
-    """Ingest website/social data into ChromaDB (Vector DB)."""
+    """Ingest website/social data into ChromaDB (background job)."""
     logger.info("--- Admin API: Received request to ingest ChromaDB data ---")
-    try:
-        items_added = db_service.run_chroma_ingestion()
-        clear_semantic_cache()
-        return {
-            "message": "ChromaDB ingestion successful.",
-            "items_added": items_added
-        }
-    except Exception as e:
-        logger.error(f"Error during ChromaDB ingestion: {e}", exc_info=True)
-        return {
-            "message": f"ChromaDB ingestion failed: {str(e)}",
-            "error": str(e),
-            "status": "error"
-        }
+    return submit_job("ingest-chroma", chroma_ingestion_job, "ChromaDB ingestion started.", group="chroma")
 
-@router.delete("/clear-chroma")
+@router.delete("/clear-chroma", status_code=202)
 async def clear_chroma_data():
-    """Clear all data from ChromaDB."""
+    """Clear all data from ChromaDB (background job)."""
     logger.info("--- Admin API: Received request to clear ChromaDB ---")
-    try:
-        message = db_service.run_clear_chroma()
-        return {
-            "message": message,
-            "items_added": 0
-        }
-    except Exception as e:
-        logger.error(f"Error clearing ChromaDB: {e}", exc_info=True)
-        return {
-            "message": f"ChromaDB clearing failed: {str(e)}",
-            "error": str(e),
-            "status": "error"
-        }
+    return submit_job("clear-chroma", db_service.run_clear_chroma, "ChromaDB clearing started.", group="chroma")
     
-@router.delete("/clear-neo4j")
+@router.delete("/clear-neo4j", status_code=202)
 async def clear_neo4j_data():
-    """Clear all nodes and relationships from Neo4j."""
+    """Clear all nodes and relationships from Neo4j (background job)."""
     logger.info("--- Admin API: Received request to clear Neo4j ---")
+    return submit_job("clear-neo4j", clear_neo4j_job, "Neo4j clearing started.", group="neo4j")
+
+# --- BACKGROUND JOBS ---
+
+@router.get("/jobs")
+async def list_jobs():
+    """Recent and running admin jobs, newest first."""
+    return {"jobs": [job.to_dict() for job in job_runner.list()]}
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status, progress, ETA and result of one job."""
+    job = job_runner.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict()
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """
+    Ask a job to stop at its next progress checkpoint. Chroma ingestion builds a
+    new collection, so cancelling it leaves the live one untouched. Neo4j
+    ingestion wipes and reloads the graph in place: during that step the
+    request is refused with 409 rather than leaving the graph half loaded.
+    """
     try:
-        message = neo4j_service.run_clear_neo4j() 
-        return {
-            "message": message,
-            "status": "success"
-        }
+        job = job_runner.cancel(job_id)
+    except JobNotCancellable as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict()
+
+# --- SEMANTIC CACHE ---
+
+@router.get("/semantic-cache/stats")
+async def semantic_cache_stats():
+    """Hit/miss counters, similarity score histogram, entry count, evictions and lookup latency."""
+    try:
+        return get_semantic_cache_stats()
     except Exception as e:
-        logger.error(f"Error clearing Neo4j: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
+        logger.error(f"Failed to collect semantic cache stats: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to retrieve semantic cache stats")
+
+@router.post("/semantic-cache/warmup", status_code=202)
+async def warmup_semantic_cache(file: Optional[UploadFile] = File(None)):
+    """
+    Pre-populate the semantic cache with answers to frequent questions (background job).
+    Upload a .txt (one question per line) or .json list, or omit the file
+    to use 'data/warmup_questions.txt'.
+    """
+    logger.info("--- Admin API: Received request to warm up semantic cache ---")
+    try:
+        if file is not None:
+            questions = parse_questions((await file.read()).decode("utf-8"))
+        else:
+            questions = load_warmup_questions()
+    except (UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Could not read questions: {str(e)}")
+
+    if not questions:
+        raise HTTPException(status_code=400, detail="No warm-up questions provided.")
+
+    return submit_job(
+        "semantic-cache-warmup",
+        lambda: run_cache_warmup_job(questions),
+        f"Cache warm-up started for {len(questions)} questions."
+    )
+
+# --- RETRIEVAL CACHE ---
+
+@router.get("/retrieval-cache/stats")
+async def retrieval_cache_stats():
+    """Hits, misses, evictions, entry count and current collection generation of the vector search cache."""
+    return retrieval_cache.stats()
+
+@router.get("/retrieval-relevance/stats")
+async def retrieval_relevance_stats():
+    """Chosen-k and relevance score distributions of vector searches, plus the most recent queries."""
+    return get_relevance_stats()
+
+# --- CYPHER CACHE ---
+
+@router.get("/cypher-cache/stats")
+async def cypher_cache_stats():
+    """Hits, misses, evictions and schema invalidations of the question -> Cypher cache."""
+    return cypher_cache.stats()
+
+@router.get("/cypher-templates/stats")
+async def cypher_template_stats():
+    """How many graph questions were answered from Cypher templates vs LLM-generated Cypher, per intent."""
+    return get_template_stats()
 
 # --- PRODUCT MANAGEMENT ---
 
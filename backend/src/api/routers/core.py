@@ -1,6 +1,7 @@
 from fastapi import APIRouter
-from pydantic import BaseModel
-from typing import List, Dict, Any
+from pydantic import BaseModel, Field
+from datetime import date
+from typing import List, Dict, Any, Literal, Optional
 
 # IMPORT LOGGER
 from src.utils.logging_config import get_logger
@@ -26,18 +27,43 @@ class ClearResponse(BaseModel):
 # Models for DB/Admin
 class DbQueryRequest(BaseModel):
     question: str
+    # answer: natural-language answer from the QA prompt
+    # rows:   the graph rows as JSON, without the QA LLM call
+    mode: Literal["answer", "rows"] = "answer"
 
 class DbQueryResponse(BaseModel):
     result: str
+    # Set in "rows" mode: one dict per product (name, price, url, sku)
+    rows: Optional[List[Dict[str, Any]]] = None
 
 class IngestResponse(BaseModel):
     message: str
     items_added: int
 
 # Models for Vector Store
-class VectorQueryRequest(BaseModel):
-    question: str
+class VectorSearchOptions(BaseModel):
     k: int = 5
+    # dense | lexical | hybrid; None uses VECTOR_SEARCH_MODE
+    mode: Optional[Literal["dense", "lexical", "hybrid"]] = None
+    # Metadata filters, applied inside the Chroma query (None = no filter)
+    sources: Optional[List[Literal["website", "linkedin", "facebook", "tiktok"]]] = None
+    engagement_type: Optional[Literal["facebook_post", "tiktok_post"]] = None
+    date_from: Optional[date] = None  # on post_time, inclusive; social posts only
+    date_to: Optional[date] = None
+
+class VectorQueryRequest(VectorSearchOptions):
+    question: str
+
+class VectorBatchQueryRequest(VectorSearchOptions):
+    # Filters and options apply to every question in the batch
+    questions: List[str] = Field(..., min_length=1, max_length=100)
+
+class VectorBatchResult(BaseModel):
+    question: str
+    result: str
+
+class VectorBatchQueryResponse(BaseModel):
+    results: List[VectorBatchResult]
 
 class RawChunksResponse(BaseModel):
     results: List[DocumentResult]
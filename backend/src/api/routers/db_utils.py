@@ -9,7 +9,11 @@ from ..services import db_service
 
 # Import shared models from .core
 from .core import (
+    VectorSearchOptions,
     VectorQueryRequest, 
+    VectorBatchQueryRequest,
+    VectorBatchQueryResponse,
+    VectorBatchResult,
     DbQueryResponse,    
     RawChunksResponse,
     IngestResponse  
@@ -20,24 +24,53 @@ logger = get_logger(__name__)
 # Create a new router
 router = APIRouter(prefix="/db", tags=["Database Utilities"])
 
+def search_filters(query: VectorSearchOptions):
+    return db_service.normalize_filters(
+        sources=query.sources,
+        engagement_type=query.engagement_type,
+        date_from=query.date_from,
+        date_to=query.date_to
+    )
+
 # Database Utility Endpoints
 @router.post("/vector/search", response_model=DbQueryResponse)
 async def search_vector_db(query: VectorQueryRequest):
     """
-    Receives a natural language question, performs a semantic search,
-    and returns the formatted result as a single string.
+    Receives a natural language question, performs a semantic, keyword or
+    hybrid search (see `mode`), and returns the formatted result as a single string.
     
     This is the primary endpoint your agent's 'query_vector_db' node will call.
     """
     logger.info(f"Received Vector DB search request: {query.question}")
     try:
         # Call the formatted chunk function from the service file
-        answer = await db_service.get_formatted_chunks(query.question, k=query.k)
+        answer = await db_service.get_formatted_chunks(
+            query.question, k=query.k, mode=query.mode, filters=search_filters(query)
+        )
         return DbQueryResponse(result=answer)
     except Exception as e:
         logger.error(f"Error in /db/vector/search: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/vector/search-batch", response_model=VectorBatchQueryResponse)
+async def search_vector_db_batch(query: VectorBatchQueryRequest):
+    """
+    Runs many searches at once (evaluation jobs, cache warm-up): all questions are
+    embedded in one call and sent to Chroma as a single multi-query request.
+    Returns one formatted result per question, in order.
+    """
+    logger.info(f"Received Vector DB batch search request: {len(query.questions)} questions")
+    try:
+        answers = await db_service.get_formatted_chunks_batch(
+            query.questions, k=query.k, mode=query.mode, filters=search_filters(query)
+        )
+        return VectorBatchQueryResponse(results=[
+            VectorBatchResult(question=q, result=a) for q, a in zip(query.questions, answers)
+        ])
+    except Exception as e:
+        logger.error(f"Error in /db/vector/search-batch: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/vector/raw-chunks", response_model=RawChunksResponse)
 async def get_vector_chunks(query: VectorQueryRequest):
     """
@@ -48,7 +81,9 @@ async def get_vector_chunks(query: VectorQueryRequest):
     logger.info(f"Received Vector DB raw chunks request: {query.question}")
     try:
         # Call the raw chunk function from the service file
-        documents = await db_service.get_raw_chunks(query.question, k=query.k)
+        documents = await db_service.get_raw_chunks(
+            query.question, k=query.k, mode=query.mode, filters=search_filters(query)
+        )
         return RawChunksResponse(results=documents)
     except Exception as e:
         logger.error(f"Error in /db/vector/raw-chunks: {e}", exc_info=True)
@@ -1,5 +1,7 @@
 import os
-from typing import TypedDict, List, Optional, Any
+import re
+from datetime import date, timedelta
+from typing import TypedDict, List, Optional, Any, Dict
 from dotenv import load_dotenv
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 from langchain_openai import ChatOpenAI
@@ -8,6 +10,7 @@ from langchain_core.output_parsers import StrOutputParser, JsonOutputParser
 from langgraph.graph import StateGraph, END
 import httpx 
 from src.api.services.semantic_cache import check_semantic_cache, add_to_semantic_cache
+from src.api.services.context_packer import pack_context, format_rows
 
 # IMPORT LOGGER
 from src.utils.logging_config import get_logger
@@ -21,6 +24,9 @@ logger = get_logger(__name__)
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
+# rows:   the graph endpoint returns product rows and synthesis formats them (one LLM call fewer)
+# answer: the graph endpoint phrases an answer with its own QA prompt first
+GRAPH_QUERY_MODE = os.getenv("GRAPH_QUERY_MODE", "rows").strip().lower()
 
 # Initialize LLM 
 llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
@@ -111,12 +117,17 @@ def query_graph_db(state: AgentState) -> AgentState:
     try:
         response = httpx.post(
             f"{API_BASE_URL}/db/graph/query",
-            json={"question": question},
+            json={"question": question, "mode": GRAPH_QUERY_MODE},
             timeout=120.0 
         )
         response.raise_for_status() 
         result = response.json()
         result_text = result.get('result', "Error: No result found.")
+
+        if result.get("rows"):
+            # Synthesis reads the product rows directly
+            intermediate_steps.append({"tool": "neo4j_qa", "result": format_rows(result["rows"])})
+            return {"intermediate_steps": intermediate_steps}
         
         no_results_indicators = ["No result found", "Error", "No data", "not found", "No information", "[]"]
         has_results = not any(indicator.lower() in result_text.lower() for indicator in no_results_indicators)
@@ -132,19 +143,72 @@ def query_graph_db(state: AgentState) -> AgentState:
 
     return {"intermediate_steps": intermediate_steps}
 
+# Platform names that pin a vector search to specific sources. Only explicit names
+# count: words like "post" or "latest" also appear in product questions
+# ("post-paid", "latest fibre packages") and must not hide the website pages.
+SOURCE_KEYWORDS = {
+    "facebook": ("facebook", " fb "),
+    "tiktok": ("tiktok", "tik tok"),
+    "linkedin": ("linkedin",),
+    "website": ("website", "web site", "webpage"),
+}
+SOCIAL_SOURCES = ["facebook", "tiktok", "linkedin"]
+
+def vector_search_filters(question: str, today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Cheap keyword heuristics that narrow the vector search:
+    named platforms (or "social media") -> those sources,
+    explicit date phrases ("last month", "in 2024") -> a post_time date range.
+    """
+    text = f" {question.lower()} "
+    today = today or date.today()
+    filters: Dict[str, Any] = {}
+
+    sources = [s for s, words in SOURCE_KEYWORDS.items() if any(w in text for w in words)]
+    if not sources and "social media" in text:
+        sources = list(SOCIAL_SOURCES)
+    if sources:
+        filters["sources"] = sources
+
+    year = re.search(r"\b(?:in|during) (20\d{2})\b", text)
+    if year:
+        filters["date_from"] = f"{year.group(1)}-01-01"
+        filters["date_to"] = f"{year.group(1)}-12-31"
+    elif "this year" in text:
+        filters["date_from"] = today.replace(month=1, day=1).isoformat()
+    elif "this month" in text:
+        filters["date_from"] = today.replace(day=1).isoformat()
+    elif "last month" in text:
+        last_day = today.replace(day=1) - timedelta(days=1)
+        filters["date_from"] = last_day.replace(day=1).isoformat()
+        filters["date_to"] = last_day.isoformat()
+
+    # Website pages have no post time, so a date range implies social posts
+    if "date_from" in filters and "sources" not in filters:
+        filters["sources"] = list(SOCIAL_SOURCES)
+    return filters
+
+def search_vector_api(question: str, filters: Dict[str, Any]) -> str:
+    response = httpx.post(
+        f"{API_BASE_URL}/db/vector/search", 
+        json={"question": question, **filters},
+        timeout=60.0
+    )
+    response.raise_for_status() 
+    return response.json().get("result", "No relevant information found.")
+
 def query_vector_db(state: AgentState) -> AgentState:
     logger.info("---NODE: query_vector_db (calling API)---")
     question = state["question"]
     intermediate_steps = state.get("intermediate_steps", [])
 
     try:
-        response = httpx.post(
-            f"{API_BASE_URL}/db/vector/search", 
-            json={"question": question},
-            timeout=60.0
-        )
-        response.raise_for_status() 
-        retrieved_docs_str = response.json().get("result", "No relevant information found.")
+        filters = vector_search_filters(question)
+        retrieved_docs_str = search_vector_api(question, filters)
+        if filters and (not retrieved_docs_str or "No relevant information" in retrieved_docs_str):
+            # The heuristics were too narrow for this question; search everything
+            logger.info(f"No results with filters {filters}. Retrying unfiltered.")
+            retrieved_docs_str = search_vector_api(question, {})
         
         if not retrieved_docs_str or "No relevant information" in retrieved_docs_str:
              logger.info("Vector DB API returned no documents.")
@@ -304,7 +368,7 @@ def route_query(state: AgentState) -> AgentState:
 
     # Check Semantic Cache for safe routes 
     if route_decision in ["graph_db", "vector_db"]:
-        cached_answer = check_semantic_cache(question, threshold=0.85)
+        cached_answer = check_semantic_cache(question)
         if cached_answer:
             return {"route": "cache_hit", "cached_response": cached_answer, "intermediate_steps": []}
 
@@ -507,7 +571,7 @@ def generate_response(state: AgentState) -> AgentState:
         final_answer = stock_error["message"]
     else:
         # --- FINAL SYNTHESIS ---
-        context_str = "\n".join([str(step) for step in intermediate_steps])
+        context_str = pack_context(intermediate_steps)
         history_str = "\n".join([f"{msg.type.upper()}: {msg.content}" for msg in chat_history])
         
         final_answer = synthesis_chain.invoke({
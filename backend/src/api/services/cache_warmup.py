@@ -0,0 +1,113 @@
+import os
+import json
+import time
+import asyncio
+from typing import List, Dict, Any
+
+from src.api.services.semantic_cache import count_semantic_cache_entries
+from src.api.services.job_runner import report_progress
+
+# IMPORT LOGGER
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.join(script_dir, '..', '..', '..')
+WARMUP_QUESTIONS_PATH = os.path.join(project_root, 'data', 'warmup_questions.txt')
+
+# Keep warm-up gentle so it never competes with real customer traffic
+WARMUP_CONCURRENCY = int(os.getenv("CACHE_WARMUP_CONCURRENCY", "2"))
+WARMUP_DELAY_SECONDS = float(os.getenv("CACHE_WARMUP_DELAY_SECONDS", "0.5"))
+WARMUP_MAX_QUESTIONS = int(os.getenv("CACHE_WARMUP_MAX_QUESTIONS", "500"))
+
+def parse_questions(raw: str) -> List[str]:
+    """
+    Accepts either a JSON list of strings or plain text with one question per line.
+    Blank lines, '#' comments and duplicates are dropped.
+    """
+    raw = raw.strip()
+    if not raw:
+        return []
+
+    if raw.startswith("["):
+        candidates = [str(q) for q in json.loads(raw)]
+    else:
+        candidates = [line for line in raw.splitlines() if not line.strip().startswith("#")]
+
+    seen = set()
+    questions = []
+    for q in candidates:
+        q = q.strip()
+        if q and q.lower() not in seen:
+            seen.add(q.lower())
+            questions.append(q)
+    return questions[:WARMUP_MAX_QUESTIONS]
+
+def load_warmup_questions(file_path: str = WARMUP_QUESTIONS_PATH) -> List[str]:
+    if not os.path.exists(file_path):
+        logger.warning(f"Warm-up questions file not found: {file_path}")
+        return []
+    with open(file_path, "r", encoding="utf-8") as f:
+        return parse_questions(f.read())
+
+async def run_cache_warmup(questions: List[str], concurrency: int = WARMUP_CONCURRENCY) -> Dict[str, Any]:
+    """
+    Runs each question through the agent (no chat history, guest user) so that
+    answers on the graph_db / vector_db routes land in the semantic cache.
+    """
+    from src.api.services.agent_graph import app as agent_app
+
+    logger.info(f"--- Cache Warm-up: {len(questions)} questions, concurrency {concurrency} ---")
+    start = time.perf_counter()
+    entries_before = count_semantic_cache_entries() or 0
+
+    outcomes = {"answered": 0, "already_cached": 0, "skipped": 0, "failed": 0}
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    done = 0
+    report_progress(0, len(questions), unit="questions", message="Warming up semantic cache")
+
+    async def warm(question: str):
+        nonlocal done
+        async with semaphore:
+            # Checkpoint between questions: raises JobCancelled once cancellation is requested
+            report_progress(done)
+            try:
+                final_state = await agent_app.ainvoke({
+                    "question": question,
+                    "chat_history": [],
+                    "user_id": None
+                })
+                route = final_state.get("route")
+                if route == "cache_hit":
+                    outcomes["already_cached"] += 1
+                elif route in ["neo4j", "vector"]:
+                    outcomes["answered"] += 1
+                else:
+                    # Greetings, order flows etc. are never cached
+                    outcomes["skipped"] += 1
+            except Exception as e:
+                outcomes["failed"] += 1
+                logger.error(f"Warm-up failed for '{question[:50]}': {e}")
+            done += 1
+            report_progress(done)
+            # Yield between questions so live requests get the worker first
+            await asyncio.sleep(WARMUP_DELAY_SECONDS)
+
+    await asyncio.gather(*(warm(q) for q in questions))
+
+    entries_after = count_semantic_cache_entries() or 0
+    elapsed = time.perf_counter() - start
+    report = {
+        "questions": len(questions),
+        **outcomes,
+        "entries_produced": max(entries_after - entries_before, 0),
+        "cache_entries": entries_after,
+        "elapsed_seconds": round(elapsed, 2),
+    }
+    logger.info(f"🔥 Cache Warm-up complete: {report}")
+    return report
+
+def run_cache_warmup_job(questions: List[str]) -> Dict[str, Any]:
+    """Entry point for the admin job runner: runs the warm-up on the job's worker thread."""
+    return asyncio.run(run_cache_warmup(questions))
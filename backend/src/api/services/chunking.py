@@ -0,0 +1,241 @@
+import os
+import re
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+# IMPORT LOGGER
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# --- CONFIGURATION ---
+# CHUNKER:
+#   structured - token-sized chunks cut on heading/paragraph boundaries, short posts kept whole (default)
+#   character  - the original 1000/200 character splitter for every source
+CHUNKER = os.getenv("CHUNKER", "structured").strip().lower()
+CHUNK_TOKENS = int(os.getenv("CHUNK_TOKENS", "300"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "40"))
+# Social posts up to this size are stored as a single chunk
+POST_MAX_TOKENS = int(os.getenv("POST_MAX_TOKENS", "1000"))
+CHUNK_ENCODING = os.getenv("CHUNK_ENCODING", "cl100k_base")
+# Batches of at least CHUNK_PARALLEL_MIN_DOCS documents are split across a process pool
+CHUNK_WORKERS = int(os.getenv("CHUNK_WORKERS", str(min(4, os.cpu_count() or 1))))
+CHUNK_PARALLEL_MIN_DOCS = int(os.getenv("CHUNK_PARALLEL_MIN_DOCS", "64"))
+# Documents buffered during ingestion before a batch is split
+CHUNK_BATCH_SIZE = int(os.getenv("CHUNK_BATCH_SIZE", "256"))
+
+# Original splitter, kept for CHUNKER=character and benchmark comparisons
+character_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+
+# --- TOKEN COUNTING ---
+_encoding = None
+_encoding_failed = False
+# Without the tiktoken vocabulary (e.g. offline), words are counted in 4-character pieces,
+# which tracks BPE token counts closely enough for sizing chunks.
+_APPROX_TOKEN = re.compile(r"\w{1,4}|[^\w\s]")
+
+def _get_encoding():
+    global _encoding, _encoding_failed
+    if _encoding is None and not _encoding_failed:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding(CHUNK_ENCODING)
+        except Exception as e:
+            _encoding_failed = True
+            logger.warning(f"tiktoken encoding '{CHUNK_ENCODING}' unavailable ({e}). Approximating token counts.")
+    return _encoding
+
+def token_count(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(_APPROX_TOKEN.findall(text))
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """The longest prefix of `text` that is at most `max_tokens` tokens."""
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+    for n, match in enumerate(_APPROX_TOKEN.finditer(text), start=1):
+        if n == max_tokens:
+            return text[:match.end()]
+    return text
+
+# Last resort for a single paragraph longer than a chunk: sentence, then word boundaries
+_sentence_splitter = RecursiveCharacterTextSplitter(
+    chunk_size=CHUNK_TOKENS,
+    chunk_overlap=CHUNK_OVERLAP_TOKENS,
+    length_function=token_count,
+    separators=[". ", "? ", "! ", "; ", ", ", " ", ""],
+    keep_separator="end"
+)
+
+# --- STRUCTURE ---
+_MARKDOWN_HEADING = re.compile(r"^#{1,6}\s+\S")
+
+def _looks_like_heading(line: str) -> bool:
+    """
+    Scraped pages are plain text, one element per line, so headings are recognised
+    by shape: a markdown heading, or a short line without closing punctuation.
+    """
+    if _MARKDOWN_HEADING.match(line):
+        return True
+    words = line.split()
+    return 0 < len(words) <= 8 and line[0].isupper() and line[-1] not in ".,;:!?)\"'"
+
+def split_sections(text: str) -> List[Tuple[Optional[str], List[str]]]:
+    """
+    Groups a page into (heading, paragraphs) sections. A heading-shaped line only opens
+    a section when the next line is body text, so menus and lists of short names stay together.
+    """
+    lines = [line.strip() for line in text.splitlines()]
+    sections: List[Tuple[Optional[str], List[str]]] = [(None, [])]
+    paragraph: List[str] = []
+
+    def end_paragraph():
+        if paragraph:
+            sections[-1][1].append("\n".join(paragraph))
+            paragraph.clear()
+
+    # Next non-empty line after each position
+    following = [""] * len(lines)
+    upcoming = ""
+    for i in range(len(lines) - 1, -1, -1):
+        following[i] = upcoming
+        upcoming = lines[i] or upcoming
+
+    for line, next_line in zip(lines, following):
+        if not line:
+            end_paragraph()
+            continue
+        if _looks_like_heading(line) and next_line and not _looks_like_heading(next_line):
+            end_paragraph()
+            sections.append((line.lstrip("# ").strip(), []))
+        else:
+            paragraph.append(line)
+    end_paragraph()
+    return [(heading, body) for heading, body in sections if heading or body]
+
+def _paragraph_units(paragraph: str) -> List[str]:
+    """A paragraph as units no larger than a chunk: itself, its lines, or sentence-split pieces."""
+    if token_count(paragraph) <= CHUNK_TOKENS:
+        return [paragraph]
+    units = []
+    for line in paragraph.split("\n"):
+        if token_count(line) <= CHUNK_TOKENS:
+            units.append(line)
+        else:
+            units.extend(_sentence_splitter.split_text(line))
+    return units
+
+def split_structured(text: str) -> List[Tuple[Optional[str], str]]:
+    """
+    Packs whole sections into chunks of up to CHUNK_TOKENS. A section that does not fit
+    on its own is cut on paragraph/line boundaries; its continuation chunks repeat the
+    heading and the last ~CHUNK_OVERLAP_TOKENS of the previous chunk.
+    Returns (heading, chunk_text) pairs.
+    """
+    chunks: List[Tuple[Optional[str], str]] = []
+    current: List[str] = []
+    current_heading: Optional[str] = None
+    current_tokens = 0
+
+    def emit():
+        nonlocal current, current_tokens
+        if current:
+            chunks.append((current_heading, "\n".join(current)))
+        current, current_tokens = [], 0
+
+    for heading, paragraphs in split_sections(text):
+        block = "\n".join(([heading] if heading else []) + paragraphs)
+        block_tokens = token_count(block)
+        # Whole section fits alongside what is already buffered
+        if current_tokens + block_tokens <= CHUNK_TOKENS:
+            current.append(block)
+            current_tokens += block_tokens
+            current_heading = current_heading or heading
+            continue
+        emit()
+        if block_tokens <= CHUNK_TOKENS:
+            current, current_tokens, current_heading = [block], block_tokens, heading
+            continue
+
+        # Oversized section: fill chunks unit by unit
+        current_heading = heading
+        prefix = [heading] if heading else []
+        current, current_tokens = list(prefix), token_count(heading) if heading else 0
+        for unit in (u for p in paragraphs for u in _paragraph_units(p)):
+            unit_tokens = token_count(unit)
+            if current_tokens + unit_tokens > CHUNK_TOKENS and len(current) > len(prefix):
+                overlap, overlap_tokens = [], 0
+                for previous in reversed(current[len(prefix):]):
+                    previous_tokens = token_count(previous)
+                    if overlap_tokens + previous_tokens > CHUNK_OVERLAP_TOKENS:
+                        break
+                    overlap.insert(0, previous)
+                    overlap_tokens += previous_tokens
+                emit()
+                current = prefix + overlap
+                current_tokens = sum(token_count(part) for part in current)
+            current.append(unit)
+            current_tokens += unit_tokens
+        emit()
+        current_heading = None
+    emit()
+    return chunks
+
+# --- DOCUMENT SPLITTING ---
+def split_document(doc: Document, chunker: str = CHUNKER) -> List[Document]:
+    """Splits one source Document into chunk Documents that inherit its metadata."""
+    if chunker == "character":
+        return character_splitter.split_documents([doc])
+
+    # Posts are short and self-contained: splitting them only loses context
+    if doc.metadata.get("type") == "post" and token_count(doc.page_content) <= POST_MAX_TOKENS:
+        return [doc]
+
+    chunks = []
+    for heading, text in split_structured(doc.page_content):
+        metadata = dict(doc.metadata)
+        if heading:
+            metadata["section"] = heading
+        chunks.append(Document(page_content=text, metadata=metadata))
+    return chunks
+
+def _split_many(docs: List[Document], chunker: str) -> List[List[Document]]:
+    return [split_document(doc, chunker) for doc in docs]
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn, not fork: the API process runs threads (job runner, drains) whose locks fork would copy
+        _pool = ProcessPoolExecutor(max_workers=CHUNK_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        logger.info(f"Chunking process pool started ({CHUNK_WORKERS} workers).")
+    return _pool
+
+def split_documents(docs: List[Document], chunker: str = CHUNKER) -> List[Document]:
+    """
+    Splits a batch of Documents, preserving order. Large batches are spread over
+    a process pool (tokenizing is CPU-bound); small ones stay in-process.
+    """
+    global _pool
+    if len(docs) < CHUNK_PARALLEL_MIN_DOCS or CHUNK_WORKERS <= 1:
+        return [chunk for doc in docs for chunk in split_document(doc, chunker)]
+
+    size = -(-len(docs) // CHUNK_WORKERS)
+    batches = [docs[i:i + size] for i in range(0, len(docs), size)]
+    try:
+        results = list(_get_pool().map(_split_many, batches, [chunker] * len(batches)))
+    except Exception as e:
+        logger.warning(f"Parallel chunking failed ({e}). Splitting in-process.")
+        _pool = None
+        return [chunk for doc in docs for chunk in split_document(doc, chunker)]
+    return [chunk for batch in results for doc_chunks in batch for chunk in doc_chunks]
@@ -0,0 +1,149 @@
+import os
+import re
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+from langchain_chroma import Chroma
+from langchain_core.embeddings import Embeddings
+
+# IMPORT LOGGER
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Blue/green versions of a logical collection: rebuilds write to '<name>_v<N>' while
+# '<name>' keeps serving from the active version, then the pointer is swapped.
+ACTIVE_POINTER_FILE = "active_collections.json"
+# How long a retired version waits for in-flight queries before it is dropped anyway
+COLLECTION_DRAIN_TIMEOUT_SECONDS = float(os.getenv("COLLECTION_DRAIN_TIMEOUT_SECONDS", "60"))
+
+def _pointer_path(persist_dir: str) -> str:
+    return os.path.join(persist_dir, ACTIVE_POINTER_FILE)
+
+def read_active_name(persist_dir: str, base_name: str) -> str:
+    """Physical collection currently serving `base_name` (the base name itself before the first rebuild)."""
+    try:
+        with open(_pointer_path(persist_dir), "r", encoding="utf-8") as f:
+            return json.load(f).get(base_name, base_name)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return base_name
+
+def write_active_name(persist_dir: str, base_name: str, name: str):
+    """Rewrites the pointer file atomically (write to a temp file, then rename over it)."""
+    path = _pointer_path(persist_dir)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            pointers = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        pointers = {}
+    pointers[base_name] = name
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(pointers, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class CollectionHandle:
+    """One physical Chroma collection plus a count of queries currently using it."""
+
+    def __init__(self, name: str, vector_store: Chroma):
+        self.name = name
+        self.vector_store = vector_store
+        self.inflight = 0
+
+    @property
+    def collection(self):
+        return self.vector_store._collection
+
+class VersionedCollection:
+    """
+    A logical collection (e.g. 'enterprise_data') served from one physical version at a time.
+    Readers take a lease on the active version; a rebuild fills a new version, swaps the
+    pointer under a lock, and the old version is dropped once its leases have drained.
+    """
+
+    def __init__(self, base_name: str, embeddings: Embeddings, persist_dir: str):
+        self.base_name = base_name
+        self.embeddings = embeddings
+        self.persist_dir = persist_dir
+        self.build_lock = threading.Lock()  # one rebuild at a time
+        self._cond = threading.Condition()
+        self._retiring = set()
+        self.active = self._open(read_active_name(persist_dir, base_name))
+        logger.info(f"'{base_name}' is served from collection '{self.active.name}'.")
+
+    def _open(self, name: str) -> CollectionHandle:
+        return CollectionHandle(name, Chroma(
+            collection_name=name,
+            embedding_function=self.embeddings,
+            persist_directory=self.persist_dir
+        ))
+
+    def _version(self, name: str) -> Optional[int]:
+        match = re.fullmatch(rf"{re.escape(self.base_name)}_v(\d+)", name)
+        return int(match.group(1)) if match else None
+
+    @contextmanager
+    def lease(self) -> Iterator[CollectionHandle]:
+        """Pins the active version for the duration of a query."""
+        with self._cond:
+            handle = self.active
+            handle.inflight += 1
+        try:
+            yield handle
+        finally:
+            with self._cond:
+                handle.inflight -= 1
+                self._cond.notify_all()
+
+    def create_version(self) -> CollectionHandle:
+        """Creates the next empty version. Leftovers from interrupted builds are removed first."""
+        client = self.active.vector_store._client
+        names = [c if isinstance(c, str) else c.name for c in client.list_collections()]
+        versions = {name: self._version(name) for name in names if self._version(name) is not None}
+        for name in versions:
+            if name != self.active.name and name not in self._retiring:
+                logger.warning(f"Removing unfinished collection version '{name}'.")
+                client.delete_collection(name)
+        name = f"{self.base_name}_v{max(versions.values(), default=0) + 1}"
+        logger.info(f"Building new collection version '{name}'...")
+        return self._open(name)
+
+    def swap(self, new_handle: CollectionHandle) -> CollectionHandle:
+        """Makes `new_handle` the active version and returns the one it replaced."""
+        with self._cond:
+            # Persist first: after a restart the pointer always names a complete version
+            write_active_name(self.persist_dir, self.base_name, new_handle.name)
+            old_handle, self.active = self.active, new_handle
+        logger.info(f"'{self.base_name}' now served from '{new_handle.name}' (was '{old_handle.name}').")
+        return old_handle
+
+    def discard(self, handle: CollectionHandle):
+        """Deletes a version that never went live (failed build)."""
+        try:
+            handle.vector_store.delete_collection()
+            logger.info(f"Discarded collection version '{handle.name}'.")
+        except Exception as e:
+            logger.error(f"Could not delete collection version '{handle.name}': {e}")
+
+    def retire(self, handle: CollectionHandle, on_dropped: Optional[Callable[[str], None]] = None):
+        """Drops a replaced version in the background once queries using it have finished."""
+        self._retiring.add(handle.name)
+
+        def drain():
+            deadline = time.monotonic() + COLLECTION_DRAIN_TIMEOUT_SECONDS
+            with self._cond:
+                while handle.inflight > 0 and time.monotonic() < deadline:
+                    self._cond.wait(timeout=deadline - time.monotonic())
+                if handle.inflight > 0:
+                    logger.warning(f"{handle.inflight} queries still using '{handle.name}' after "
+                                   f"{COLLECTION_DRAIN_TIMEOUT_SECONDS}s. Dropping it anyway.")
+            self.discard(handle)
+            if on_dropped:
+                on_dropped(handle.name)
+            self._retiring.discard(handle.name)
+
+        threading.Thread(target=drain, name=f"retire-{handle.name}", daemon=True).start()
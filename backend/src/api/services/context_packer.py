@@ -0,0 +1,134 @@
+import os
+from typing import Any, List
+
+from src.api.services.chunking import token_count, truncate_to_tokens
+
+# IMPORT LOGGER
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# --- CONFIGURATION ---
+# Upper bound for the 'Intermediate Steps Context' of the synthesis prompt
+SYNTHESIS_CONTEXT_TOKEN_BUDGET = int(os.getenv("SYNTHESIS_CONTEXT_TOKEN_BUDGET", "2500"))
+
+# Steps the answer depends on word for word (order form signal, auth/stock
+# messages, order history): never dropped, only truncated as a last resort.
+ESSENTIAL_TYPES = {"order_form", "auth_error", "stock_error", "error", "order_status_context", "cancel_context"}
+NO_DATA_RESULTS = {"", "None", "[]", "No result found", "No result."}
+# Empty-result messages of the vector search vary ("No relevant info",
+# "No relevant information found in the vector database.", ...)
+NO_DATA_PREFIXES = ("No relevant info",)
+TRUNCATION_MARK = " ...[truncated]"
+
+
+def is_no_data(result: str) -> bool:
+    return result in NO_DATA_RESULTS or result.startswith(NO_DATA_PREFIXES)
+
+
+class Section:
+    """One rendered step: a label plus content blocks, ordered most relevant first."""
+
+    def __init__(self, label: str, blocks: List[str], essential: bool = False, has_data: bool = True,
+                 separator: str = "\n"):
+        self.label = label
+        self.blocks = blocks
+        self.essential = essential
+        self.has_data = has_data
+        self.separator = separator
+
+    def render(self) -> str:
+        return f"[{self.label}]\n" + self.separator.join(self.blocks)
+
+    def tokens(self) -> int:
+        return token_count(self.render())
+
+def format_rows(rows: List[dict]) -> str:
+    """Graph rows as one labelled line each, e.g. 'name: X | price: Rs. 4,990.00 | url: ... | sku: ...'."""
+    lines = []
+    for row in rows:
+        fields = []
+        for key, value in row.items():
+            if value is None or value == "":
+                continue
+            if key == "price" and isinstance(value, (int, float)):
+                value = f"Rs. {value:,.2f}"
+            fields.append(f"{key}: {value}")
+        lines.append(" | ".join(fields))
+    return "\n".join(line for line in lines if line)
+
+def render_step(step: Any) -> Section:
+    """Compact text for one intermediate step instead of its Python dict repr."""
+    if not isinstance(step, dict):
+        return Section("context", [str(step)])
+
+    if step.get("type"):
+        kind = step["type"]
+        text = step.get("message") or step.get("context") or ""
+        if kind == "order_form":
+            # The synthesis prompt looks for the literal word 'order_form'
+            text = f"{text} (product: {step.get('prefill_product', '')})"
+        return Section(kind, [text], essential=kind in ESSENTIAL_TYPES)
+
+    tool = step.get("tool", "context")
+    if "error" in step:
+        return Section(tool, [f"Error: {step['error']}"], has_data=False)
+    result = str(step.get("result", "")).strip()
+    if step.get("no_results") or is_no_data(result):
+        return Section(tool, [result or "No results."], has_data=False)
+    # Vector results are chunks in relevance order separated by blank lines,
+    # graph answers are line-oriented; either way trimming starts at the end.
+    separator = "\n\n" if "\n\n" in result else "\n"
+    return Section(tool, [block for block in result.split(separator) if block.strip()], separator=separator)
+
+def pack_context(intermediate_steps: List[Any], budget: int = SYNTHESIS_CONTEXT_TOKEN_BUDGET) -> str:
+    """
+    Renders the agent's intermediate steps into at most `budget` tokens:
+    1. repeated results (e.g. a vector fallback returning the same chunks) are kept once
+    2. "no results"/error notes are dropped when other steps returned data
+    3. trailing (lowest-ranked) blocks of the largest sections are dropped
+    4. as a last resort the largest remaining block is truncated
+    """
+    sections: List[Section] = []
+    seen = set()
+    for step in intermediate_steps:
+        section = render_step(step)
+        key = "\n".join(section.blocks)
+        if key in seen and not section.essential:
+            continue
+        seen.add(key)
+        sections.append(section)
+
+    raw_tokens = token_count("\n".join(str(step) for step in intermediate_steps))
+
+    def total() -> int:
+        return token_count("\n\n".join(section.render() for section in sections))
+
+    if total() > budget and any(section.has_data for section in sections):
+        sections = [section for section in sections if section.has_data or section.essential]
+
+    used = total()
+    while used > budget:
+        trimmable = [s for s in sections if not s.essential and len(s.blocks) > 1]
+        if trimmable:
+            max(trimmable, key=Section.tokens).blocks.pop()
+        else:
+            # Single oversized blocks left: cut the biggest (non-essential first) down to fit
+            candidates = [s for s in sections if not s.essential] or sections
+            largest = max(candidates, key=Section.tokens)
+            block = largest.blocks[-1]
+            if block.endswith(TRUNCATION_MARK):
+                block = block[:-len(TRUNCATION_MARK)]
+            keep = max(token_count(block) - (used - budget) - token_count(TRUNCATION_MARK), 0)
+            if keep == 0 and len(sections) > 1 and not largest.essential:
+                sections.remove(largest)
+            else:
+                largest.blocks[-1] = truncate_to_tokens(block, keep) + TRUNCATION_MARK
+                if keep == 0:
+                    break
+        used = total()
+
+    context = "\n\n".join(section.render() for section in sections)
+    if raw_tokens > used:
+        logger.info(f"Context packer: {raw_tokens} -> {used} tokens (saved {raw_tokens - used}, budget {budget}).")
+    return context
@@ -0,0 +1,13 @@
+import os
+
+from src.api.services.retrieval_cache import RetrievalCache
+
+# --- CONFIGURATION ---
+CYPHER_CACHE_ENABLED = os.getenv("CYPHER_CACHE_ENABLED", "true").lower() == "true"
+CYPHER_CACHE_SIZE = int(os.getenv("CYPHER_CACHE_SIZE", "1000"))
+
+# Question -> generated Cypher. Only queries that passed the read-only check and
+# returned rows are stored. The version is the graph schema fingerprint: generated
+# Cypher depends on labels and properties, not on the data, so only a schema
+# change drops the cache.
+cypher_cache = RetrievalCache(CYPHER_CACHE_SIZE, version=None, enabled=CYPHER_CACHE_ENABLED, name="Cypher")
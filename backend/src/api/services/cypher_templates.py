@@ -0,0 +1,228 @@
+import os
+import re
+import time
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# IMPORT LOGGER
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Deterministic Cypher for the query shapes listed in CYPHER_GENERATION_TEMPLATE
+# (category search, product name search, broad search), plus price ranges and
+# cheapest/most expensive ordering. Questions no template recognises go to the LLM.
+
+# --- CONFIGURATION ---
+CYPHER_TEMPLATES_ENABLED = os.getenv("CYPHER_TEMPLATES_ENABLED", "true").lower() == "true"
+# How long the Category names used for matching are reused before re-reading the graph
+CYPHER_TEMPLATE_CATEGORY_TTL_SECONDS = float(os.getenv("CYPHER_TEMPLATE_CATEGORY_TTL_SECONDS", "300"))
+# Fulltext matches scoring below this are dropped; with no rows left the LLM takes over
+CYPHER_TEMPLATE_MIN_FULLTEXT_SCORE = float(os.getenv("CYPHER_TEMPLATE_MIN_FULLTEXT_SCORE", "0.5"))
+
+RESULT_LIMIT = 10
+RETURN_FIELDS = "RETURN p.name, p.price, p.url, p.sku"
+PRICE_FILTER = "($min_price IS NULL OR p.price >= $min_price) AND ($max_price IS NULL OR p.price <= $max_price)"
+
+_AMOUNT = r"(?:rs\.?|lkr)?\s*(\d[\d,]*(?:\.\d+)?)\s*(k\b)?"
+_BETWEEN = re.compile(rf"\bbetween\s+{_AMOUNT}\s*(?:and|to|-)\s*{_AMOUNT}")
+_UNDER = re.compile(rf"\b(?:under|below|less than|cheaper than|up to|within|no more than|max(?:imum)?)\s+{_AMOUNT}")
+_OVER = re.compile(rf"\b(?:over|above|more than|at least|min(?:imum)?)\s+{_AMOUNT}")
+_CHEAPEST = re.compile(r"\b(cheapest|lowest[- ]price[d]?|least expensive|most affordable)\b")
+_PRICIEST = re.compile(r"\b(most expensive|priciest|highest[- ]price[d]?|top[- ]end)\b")
+_BROAD = re.compile(
+    r"\b(?:all|any|your|what|which)\s+(?:products|items|devices)\b"
+    r"|\bproducts?\s+(?:do\s+)?you\s+(?:have|sell|offer)\b"
+)
+# Phrasings that ask about a specific product ("price of X", "do you have X")
+_PRODUCT_CUE = re.compile(
+    r"^(?:what(?:'s| is) the )?(?:price|cost) (?:of|for) "
+    r"|^how much (?:is|are|does|do) "
+    r"|^(?:do you (?:have|sell)|is there|are there|show me|tell me about|details (?:of|for|about)) "
+    r"| (?:price|cost)$"
+)
+# Words without product meaning: question scaffolding, price and ordering vocabulary
+_FILLER = {
+    "a", "an", "the", "any", "some", "all", "your", "you", "we", "i", "me", "my", "it", "its", "they",
+    "anything", "something", "everything", "thing", "stuff",
+    "do", "does", "is", "are", "can", "could", "have", "has", "sell", "selling", "show", "tell", "find", "get",
+    "buy", "want", "need", "looking", "list", "give", "what", "which", "how", "much", "many", "there",
+    "about", "of", "for", "on", "in", "with", "to", "and", "or", "at", "from", "by", "that", "this", "these",
+    "please", "available", "stock", "detail", "details", "product", "item", "one", "option",
+    "price", "priced", "cost", "rs", "lkr", "cheap", "expensive", "affordable", "budget", "best", "good",
+}
+# Questions about services and policies rather than catalogue items: left to the LLM
+_NON_PRODUCT = {
+    "warranty", "guarantee", "delivery", "deliver", "shipping", "ship", "installation", "install",
+    "offer", "promotion", "promo", "discount", "deal", "latest", "new", "newest", "policy", "return",
+    "refund", "payment", "pay", "installment", "emi", "order", "track", "contact", "support", "service",
+    "package", "plan", "connection", "bill", "postpaid", "prepaid", "sim", "fibre", "fiber",
+}
+# Category name words too generic to select a category on their own
+_GENERIC = {"accessory", "device", "corner", "and", "of", "thing", "item"}
+
+def _words(text: str) -> List[str]:
+    # "Wi-Fi" and "wifi" are the same word
+    return re.findall(r"[a-z0-9]+", re.sub(r"(?<=[a-z0-9])-(?=[a-z0-9])", "", text.lower()))
+
+def _singular(word: str) -> str:
+    if len(word) > 3 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("ches", "shes", "xes", "sses")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+def _amount(number: str, thousands: Optional[str]) -> float:
+    value = float(number.replace(",", ""))
+    return value * 1000 if thousands else value
+
+def parse_price_range(text: str) -> Dict[str, Optional[float]]:
+    bounds: Dict[str, Optional[float]] = {"min_price": None, "max_price": None}
+    between = _BETWEEN.search(text)
+    if between:
+        low, high = _amount(*between.group(1, 2)), _amount(*between.group(3, 4))
+        bounds["min_price"], bounds["max_price"] = min(low, high), max(low, high)
+        return bounds
+    under = _UNDER.search(text)
+    if under:
+        bounds["max_price"] = _amount(*under.group(1, 2))
+    over = _OVER.search(text)
+    if over:
+        bounds["min_price"] = _amount(*over.group(1, 2))
+    return bounds
+
+def content_words(text: str) -> List[str]:
+    """The product-describing words of a question: price/order phrases and fillers removed, singularised."""
+    for pattern in (_BETWEEN, _UNDER, _OVER, _CHEAPEST, _PRICIEST):
+        text = pattern.sub(" ", text)
+    words = [_singular(w) for w in _words(text) if w not in _FILLER]
+    return [w for w in words if w not in _FILLER]
+
+def category_keywords(category: str) -> set:
+    """Significant words of a category name ("Mobile Phones & Accessories" -> {mobile, phone})."""
+    words = {_singular(w) for w in _words(category)}
+    return (words - _GENERIC) or words
+
+def match_categories(words: Iterable[str], categories: Iterable[str]) -> List[str]:
+    """
+    Categories whose name covers every content word of the question, e.g. "routers"
+    -> ["4G, 3G Routers", "ADSL Routers"]. Empty when some word is not a category word
+    (it is then part of a product name, as in "huawei router").
+    """
+    question = set(words) - _GENERIC or set(words)
+    if not question:
+        return []
+    return sorted(category for category in categories if question <= category_keywords(category))
+
+def _fulltext_term(words: List[str]) -> str:
+    """Lucene query requiring every name word, e.g. '+huawei~1 +b535~1'; short words must match exactly."""
+    return " ".join(f"+{word}~1" if len(word) >= 4 else f"+{word}" for word in words)
+
+class CypherPlan:
+    """Parameterized Cypher produced by a template."""
+
+    def __init__(self, intent: str, cypher: str, params: Dict[str, Any]):
+        self.intent = intent
+        self.cypher = cypher
+        self.params = params
+
+    def __repr__(self):
+        return f"CypherPlan({self.intent}, {self.params})"
+
+def plan_query(question: str, categories: Iterable[str]) -> Optional[CypherPlan]:
+    """
+    Maps a product question to template Cypher, or None if no template applies:
+    - content words all naming categories -> products in those categories
+    - other content words, with a product cue or price/order cue -> fulltext name search
+    - no content words, with a price/order cue or "what products ..." -> all products
+    Price bounds and cheapest/most expensive ordering apply to every shape.
+    """
+    text = re.sub(r"\s+", " ", question.lower()).strip().rstrip("?!. ")
+    bounds = parse_price_range(text)
+    order = "p.price ASC" if _CHEAPEST.search(text) else "p.price DESC" if _PRICIEST.search(text) else None
+    has_price_cue = order is not None or bounds["min_price"] is not None or bounds["max_price"] is not None
+    words = content_words(text)
+
+    if _NON_PRODUCT & set(words):
+        return None
+
+    if not words:
+        if has_price_cue or _BROAD.search(text):
+            return CypherPlan("broad", (
+                f"MATCH (p:Product)\nWHERE {PRICE_FILTER}\n{RETURN_FIELDS}\n"
+                f"ORDER BY {order or 'p.name'}\nLIMIT {RESULT_LIMIT}"
+            ), dict(bounds))
+        return None
+
+    matched = match_categories(words, categories)
+    if matched:
+        return CypherPlan("category", (
+            "MATCH (c:Category)<-[:IN_CATEGORY]-(p:Product)\n"
+            f"WHERE c.name IN $categories AND {PRICE_FILTER}\n{RETURN_FIELDS}\n"
+            f"ORDER BY {order or 'p.name'}\nLIMIT {RESULT_LIMIT}"
+        ), {"categories": matched, **bounds})
+
+    if has_price_cue or _PRODUCT_CUE.search(text):
+        return CypherPlan("product_name", (
+            'CALL db.index.fulltext.queryNodes("product_name_index", $term) YIELD node AS p, score\n'
+            f"WHERE score >= $min_score AND {PRICE_FILTER}\n{RETURN_FIELDS}\n"
+            f"ORDER BY {order or 'score DESC'}\nLIMIT {RESULT_LIMIT}"
+        ), {"term": _fulltext_term(words), "min_score": CYPHER_TEMPLATE_MIN_FULLTEXT_SCORE, **bounds})
+    return None
+
+class CategoryNames:
+    """Category names for matching, re-read from the graph at most once per TTL."""
+
+    def __init__(self, ttl: float = CYPHER_TEMPLATE_CATEGORY_TTL_SECONDS):
+        self.ttl = ttl
+        self._names: List[str] = []
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def get(self, load: Callable[[], List[str]]) -> List[str]:
+        with self._lock:
+            now = time.monotonic()
+            if self._loaded_at is None or now - self._loaded_at > self.ttl:
+                try:
+                    self._names = [name for name in load() if name]
+                except Exception as e:
+                    logger.warning(f"Could not load category names for Cypher templates: {e}")
+                self._loaded_at = now
+            return list(self._names)
+
+    def invalidate(self):
+        """Called after ingestion or a product sync that may add categories."""
+        with self._lock:
+            self._loaded_at = None
+
+category_names = CategoryNames()
+
+# --- COVERAGE STATISTICS ---
+# In-process counters exposed through /admin/cypher-templates/stats.
+_stats_lock = threading.Lock()
+_stats = {"questions": 0, "template_answered": 0, "template_no_rows": 0, "llm_fallback": 0, "by_intent": {}}
+
+def record_template(intent: str, rows: int):
+    with _stats_lock:
+        _stats["questions"] += 1
+        _stats["by_intent"][intent] = _stats["by_intent"].get(intent, 0) + 1
+        if rows:
+            _stats["template_answered"] += 1
+        else:
+            _stats["template_no_rows"] += 1
+
+def record_llm_fallback(after_template: bool = False):
+    """Counts an LLM generation; `after_template` when a template matched but found nothing."""
+    with _stats_lock:
+        if not after_template:
+            _stats["questions"] += 1
+        _stats["llm_fallback"] += 1
+
+def get_template_stats() -> dict:
+    with _stats_lock:
+        snapshot = {**_stats, "by_intent": dict(_stats["by_intent"])}
+    questions = snapshot["questions"]
+    snapshot["coverage"] = round(snapshot["template_answered"] / questions, 4) if questions else 0.0
+    return snapshot
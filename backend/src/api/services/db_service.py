@@ -2,16 +2,30 @@ import os
 import json
 import asyncio
 import uuid 
-from typing import List, Dict, Any
+import hashlib
+from datetime import date, datetime, time, timezone
+from typing import List, Dict, Any, Iterable, Optional
 from dotenv import load_dotenv
 from pydantic import BaseModel 
 from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
 from langchain_core.documents import Document
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 from sqlalchemy import create_engine, Column, Integer, String, Float, Text, select, update, delete, DateTime, ForeignKey, Numeric
 from sqlalchemy.orm import sessionmaker, declarative_base, relationship, joinedload
 from src.api.schemas import ProductCreate, ProductUpdate
+from src.api.services.embedding_providers import get_embeddings, check_collection_embeddings
+from src.api.services.ingestion_pipeline import write_chunks, copy_chunks, iter_json_items, INGEST_STREAM_BATCH_SIZE
+from src.api.services.lexical_index import get_lexical_index, reciprocal_rank_fusion
+from src.api.services.chunking import split_documents, CHUNK_BATCH_SIZE
+from src.api.services.collection_versions import VersionedCollection, CollectionHandle
+from src.api.services.job_runner import report_progress
+from src.api.services.diversity import mmr_select, diversity_settings, RETRIEVAL_DIVERSITY, MMR_FETCH_K
+from src.api.services.reranker import rerank, get_scorer, RERANK_CANDIDATES
+from src.api.services.retrieval_cache import retrieval_cache, normalize_question, RETRIEVAL_CACHE_ENABLED
+from src.api.services.relevance import (
+    relevance_enabled, cosine_scores, above_min_score, adaptive_k, record_selection,
+    RETRIEVAL_MIN_SCORE, RETRIEVAL_ADAPTIVE_K
+)
+import numpy as np
 import chromadb 
 
 
@@ -190,26 +204,26 @@ project_root = os.path.join(script_dir, '..', '..', '..')
 CHROMA_PERSIST_DIR = os.path.join(project_root, 'chroma_data')
 DATA_DIR = os.path.join(project_root, 'data') 
 
-embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+COLLECTION_NAME = "enterprise_data"
 
-vector_store = Chroma(
-    collection_name="enterprise_data",
-    embedding_function=embeddings,
-    persist_directory=CHROMA_PERSIST_DIR
-)
+# Retrieval mode: "dense" (Chroma only), "lexical" (BM25 only) or "hybrid" (both, fused with RRF)
+SEARCH_MODES = ("dense", "lexical", "hybrid")
+VECTOR_SEARCH_MODE = os.getenv("VECTOR_SEARCH_MODE", "hybrid")
+# Candidates each retriever contributes before fusion
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", "20"))
 
-retriever = vector_store.as_retriever(
-    search_type="similarity",
-    search_kwargs={"k": 5} 
-)
-logger.info("ChromaDB vector store and retriever initialized for service.")
+embeddings = get_embeddings(COLLECTION_NAME)
 
-# TEXT SPLITTER
-# Used for ALL data sources to ensure consistent chunking
-text_splitter = RecursiveCharacterTextSplitter(
-    chunk_size=1000,
-    chunk_overlap=200
-)
+# 'enterprise_data' is served from a versioned collection (enterprise_data_vN).
+# Ingestion builds the next version next to it and swaps it in atomically.
+collections = VersionedCollection(COLLECTION_NAME, embeddings, CHROMA_PERSIST_DIR)
+
+try:
+    check_collection_embeddings(collections.active.collection, embeddings)
+except ValueError as e:
+    logger.error(f"Embedding configuration mismatch: {e}")
+
+logger.info("ChromaDB vector store initialized for service.")
 
 # Helper function to format retrieved documents
 def format_docs(docs: List[Document]) -> str:
@@ -239,114 +253,452 @@ class DocumentResult(BaseModel):
     metadata: Dict[str, Any]
 
 # Ingestion logic
-def load_json_data(file_path):
-    if not os.path.exists(file_path):
-        logger.error(f"File not found: {file_path}")
-        return []
+def find_data_file(source: str) -> str | None:
+    """Prefers '<source>_data.jsonl' (line-delimited) over '<source>_data.json'."""
+    for extension in ("jsonl", "json"):
+        file_path = os.path.join(DATA_DIR, f"{source}_data.{extension}")
+        if os.path.exists(file_path):
+            return file_path
+    logger.error(f"File not found: {os.path.join(DATA_DIR, f'{source}_data.json')}")
+    return None
+
+def chunk_id(source: str, item_key: str, text: str) -> str:
+    """
+    Deterministic chunk ID: same source item + same chunk text -> same ID.
+    Re-ingesting unchanged content therefore never creates duplicates.
+    """
+    content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return hashlib.sha256(f"{source}|{item_key}|{content_hash}".encode("utf-8")).hexdigest()
+
+def get_existing_ids(collection, source: str) -> set:
+    """IDs of every chunk currently stored for a source (IDs only, no vectors)."""
+    existing = collection.get(where={"source": source}, include=[])
+    return set(existing["ids"])
+
+def parse_post_timestamp(value) -> int | None:
+    """ISO post time ('2024-05-01T10:00:00.000Z') -> unix seconds, so Chroma can range-filter it."""
+    if not value:
+        return None
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except json.JSONDecodeError:
-        logger.error(f"Error: Could not decode JSON from {file_path}. File might be empty or corrupt.")
-        return []
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+def build_document(entry, source: str, i: int) -> Document | None:
+    """Converts one scraped item into a LangChain Document, or None if it has no usable text."""
+    # 1. Extract Text
+    if isinstance(entry, dict):
+        # Website usually uses 'content', Social uses 'text'/'post_text'
+        text = entry.get("content") or entry.get("text") or entry.get("post_text") or entry.get("title") or entry.get("description") or ""
+    else:
+        text = str(entry)
+    
+    if not text or text == "Error scraping post details":
+        return None
 
-def ingest_data(data_list, source):
+    # 2. Extract Metadata
+    metadata = {"source": source, "type": "post" if source != "website" else "website"}
+    
+    # Helper to get ID safely
+    if source == "website":
+        metadata["url"] = entry.get("url", "website_unknown")
+    elif source == "facebook":
+        likes = entry.get("likes")
+        shares = entry.get("shares") 
+        comments = entry.get("comments")
+        reactions = entry.get("topReactionsCount")
+        metadata.update({
+            "post_id": entry.get("postId", f"{source}_{i}"),
+            "facebook_url": entry.get("url"),
+            "post_time": entry.get("time"),
+            "post_timestamp": parse_post_timestamp(entry.get("time")),
+            "likes_count": likes,
+            "shares_count": shares,
+            "comments_count": comments if isinstance(comments, int) else 0,
+            "reactions_count": reactions,
+            "engagement_type": "facebook_post"
+        })
+    elif source == "tiktok":
+        digg_count = entry.get("diggCount")
+        share_count = entry.get("shareCount")
+        play_count = entry.get("playCount")
+        comment_count = entry.get("commentCount")
+        metadata.update({
+            "post_id": entry.get("id", f"{source}_{i}"),
+            "tiktok_url": entry.get("webVideoUrl"),
+            "post_time": entry.get("createTimeISO"),
+            "post_timestamp": parse_post_timestamp(entry.get("createTimeISO")),
+            "likes_count": digg_count,
+            "shares_count": share_count,
+            "comments_count": comment_count,
+            "plays_count": play_count,
+            "engagement_type": "tiktok_post"
+        })
+    else:
+        # Default (LinkedIn, etc.)
+        metadata["post_id"] = entry.get("postId", f"{source}_{i}")
+
+    # Stable identity of the source item (page URL or post ID)
+    metadata["item_key"] = str(metadata.get("url") or metadata.get("post_id"))
+
+    return Document(page_content=text, metadata=metadata)
+
+def carry_over(live: CollectionHandle, target: CollectionHandle, ids: List[str], reuse_vectors: bool) -> int:
+    """Copies chunks as stored in the live version (used when a source could not be fully read)."""
+    include = ["documents", "metadatas", "embeddings"] if reuse_vectors else ["documents", "metadatas"]
+    copied = 0
+    for start in range(0, len(ids), 500):
+        page = live.collection.get(ids=ids[start:start + 500], include=include)
+        docs = [Document(page_content=d, metadata=m or {}) for d, m in zip(page["documents"], page["metadatas"])]
+        get_lexical_index().add(target.name, page["ids"], docs)
+        if reuse_vectors:
+            copy_chunks(target.collection, page["ids"], docs, page["embeddings"])
+        else:
+            write_chunks(target.collection, embeddings, page["ids"], docs)
+        copied += len(page["ids"])
+    return copied
+
+def ingest_data(data_items: Iterable, source: str, live: CollectionHandle, target: CollectionHandle,
+                reuse_vectors: bool = True) -> Dict[str, int]:
     """
-    Converts data list into LangChain Document objects, SPLITS THEM, 
-    and adds them to the vector store.
+    Streams items -> Document -> SPLIT chunks -> bounded batches into the new collection version.
+    Memory stays flat regardless of file size (only chunk IDs are kept for the whole source).
+    
+    Chunks that already exist in the live version are copied with their stored vectors
+    (no embedding call, fresh metadata); only new/changed chunks are embedded.
+    Chunks whose source item disappeared are simply not carried over.
+    Returns the number of chunks the target should now hold for this source.
     """
-    if not data_list:
-        logger.warning(f"No data found for {source}. Skipping.")
-        return 0
-
     logger.info(f"Preparing {source} data...")
 
-    documents_to_process: List[Document] = [] 
-    
-    for i, entry in enumerate(data_list):
-        # 1. Extract Text
-        if isinstance(entry, dict):
-            # Website usually uses 'content', Social uses 'text'/'post_text'
-            text = entry.get("content") or entry.get("text") or entry.get("post_text") or entry.get("title") or entry.get("description") or ""
-        else:
-            text = str(entry)
-        
-        # 2. Extract Metadata (if text exists)
-        if text and text != "Error scraping post details":
-            metadata = {"source": source, "type": "post" if source != "website" else "website"}
-            
-            # Helper to get ID safely
-            if source == "website":
-                metadata["url"] = entry.get("url", "website_unknown")
-            elif source == "facebook":
-                likes = entry.get("likes")
-                shares = entry.get("shares") 
-                comments = entry.get("comments")
-                reactions = entry.get("topReactionsCount")
-                metadata.update({
-                    "post_id": entry.get("postId", f"{source}_{i}"),
-                    "facebook_url": entry.get("url"),
-                    "post_time": entry.get("time"),
-                    "likes_count": likes,
-                    "shares_count": shares,
-                    "comments_count": comments if isinstance(comments, int) else 0,
-                    "reactions_count": reactions,
-                    "engagement_type": "facebook_post"
-                })
-            elif source == "tiktok":
-                digg_count = entry.get("diggCount")
-                share_count = entry.get("shareCount")
-                play_count = entry.get("playCount")
-                comment_count = entry.get("commentCount")
-                metadata.update({
-                    "post_id": entry.get("id", f"{source}_{i}"),
-                    "tiktok_url": entry.get("webVideoUrl"),
-                    "post_time": entry.get("createTimeISO"),
-                    "likes_count": digg_count,
-                    "shares_count": share_count,
-                    "comments_count": comment_count,
-                    "plays_count": play_count,
-                    "engagement_type": "tiktok_post"
-                })
+    existing_ids = get_existing_ids(live.collection, source) if reuse_vectors else set()
+    seen_ids = set()
+    pending_ids: List[str] = []
+    pending_docs: List[Document] = []
+    copy_ids: List[str] = []
+    copy_docs: List[Document] = []
+    items = 0
+    written = 0
+    copied = 0
+    complete = True
+    batch: List[Document] = []
+
+    def flush():
+        nonlocal written, copied
+        if copy_ids:
+            stored = live.collection.get(ids=copy_ids, include=["embeddings"])
+            vectors = dict(zip(stored["ids"], stored["embeddings"]))
+            found = [(i, d) for i, d in zip(copy_ids, copy_docs) if i in vectors]
+            # Anything that vanished from the live version meanwhile is embedded instead
+            for i, d in zip(copy_ids, copy_docs):
+                if i not in vectors:
+                    pending_ids.append(i)
+                    pending_docs.append(d)
+            if found:
+                get_lexical_index().add(target.name, [i for i, _ in found], [d for _, d in found])
+                copy_chunks(target.collection, [i for i, _ in found], [d for _, d in found], [vectors[i] for i, _ in found])
+                copied += len(found)
+            copy_ids.clear()
+            copy_docs.clear()
+        if pending_ids:
+            get_lexical_index().add(target.name, pending_ids, pending_docs)
+            # Batches are upserted, so a retried run stays idempotent
+            written += write_chunks(target.collection, embeddings, pending_ids, pending_docs)["written"]
+            pending_ids.clear()
+            pending_docs.clear()
+
+    def split_batch():
+        # SPLIT ITEMS (Website AND Social) a batch at a time, so large batches can use the process pool
+        for chunk in split_documents(batch):
+            doc_id = chunk_id(source, chunk.metadata["item_key"], chunk.page_content)
+            # Identical chunks inside one item collapse to one ID
+            if doc_id in seen_ids:
+                continue
+            seen_ids.add(doc_id)
+            chunk.metadata["content_hash"] = hashlib.sha256(chunk.page_content.encode("utf-8")).hexdigest()
+            if doc_id in existing_ids:
+                copy_ids.append(doc_id)
+                copy_docs.append(chunk)
             else:
-                # Default (LinkedIn, etc.)
-                metadata["post_id"] = entry.get("postId", f"{source}_{i}")
-        
-            # Create the initial document
-            doc = Document(
-                page_content=text,
-                metadata=metadata
-            )
-            documents_to_process.append(doc)
+                pending_ids.append(doc_id)
+                pending_docs.append(chunk)
+        batch.clear()
+        if len(pending_ids) + len(copy_ids) >= INGEST_STREAM_BATCH_SIZE:
+            flush()
 
-    # 3. SPLIT ALL DOCUMENTS (Website AND Social)
-    if documents_to_process:
-        logger.info(f"Splitting {len(documents_to_process)} raw {source} items...")
-        split_docs = text_splitter.split_documents(documents_to_process)
-        
-        logger.info(f"Ingesting {len(split_docs)} split chunks ({source}) into ChromaDB...")
-        vector_store.add_documents(documents=split_docs)
-        logger.info(f"{source} data successfully stored!")
-        return len(split_docs)
-    else:
+    try:
+        for i, entry in enumerate(data_items):
+            items += 1
+            doc = build_document(entry, source, i)
+            if doc is None:
+                continue
+            batch.append(doc)
+            if len(batch) >= CHUNK_BATCH_SIZE:
+                split_batch()
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        # Keep what was parsed, and carry unread items over from the live version
+        logger.error(f"Error: Could not decode {source} data after {items} items: {e}")
+        complete = False
+    split_batch()
+    flush()
+
+    carried = 0
+    if not complete:
+        carried = carry_over(live, target, list(get_existing_ids(live.collection, source) - seen_ids), reuse_vectors)
+
+    if not seen_ids:
         logger.warning(f"No valid documents found to ingest for {source}.")
-        return 0
+
+    dropped = len(existing_ids - seen_ids) if complete else 0
+    logger.info(f"{source} build complete: {items} items, {written} chunks embedded, {copied} reused, "
+                f"{carried} carried over, {dropped} dropped.")
+    return {"embedded": written, "reused": copied, "chunks": len(seen_ids) + carried}
+
+# Search filters
+def normalize_filters(sources: Optional[List[str]] = None, engagement_type: Optional[str] = None,
+                      date_from: Optional[date] = None, date_to: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Request filters -> the shape both retrievers understand. Dates are inclusive
+    days (UTC) turned into post_timestamp bounds; only social posts carry one.
+    """
+    filters: Dict[str, Any] = {}
+    if sources:
+        filters["sources"] = sorted(set(sources))
+    if engagement_type:
+        filters["engagement_type"] = engagement_type
+    if date_from:
+        filters["ts_from"] = int(datetime.combine(date_from, time.min, tzinfo=timezone.utc).timestamp())
+    if date_to:
+        filters["ts_to"] = int(datetime.combine(date_to, time.max, tzinfo=timezone.utc).timestamp())
+    return filters
+
+def build_chroma_where(filters: Optional[Dict[str, Any]]) -> Dict[str, Any] | None:
+    """Normalized filters -> a Chroma `where` clause, evaluated inside the collection query."""
+    if not filters:
+        return None
+    clauses = []
+    sources = filters.get("sources")
+    if sources:
+        clauses.append({"source": sources[0]} if len(sources) == 1 else {"source": {"$in": sources}})
+    if filters.get("engagement_type"):
+        clauses.append({"engagement_type": filters["engagement_type"]})
+    if filters.get("ts_from") is not None:
+        clauses.append({"post_timestamp": {"$gte": filters["ts_from"]}})
+    if filters.get("ts_to") is not None:
+        clauses.append({"post_timestamp": {"$lte": filters["ts_to"]}})
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
 
 # Service functions
-async def get_raw_chunks(query: str, k: int = 5) -> List[DocumentResult]:
+# Retrieval pipeline, shared by single and batch search:
+#   1. cache lookup  2. candidate retrieval (dense batch query / BM25 / fused)
+#   3. optional rerank  4. relevance threshold  5. MMR / near-duplicate removal
+#   6. adaptive k  7. cache store
+def dense_search_batch(store: CollectionHandle, queries: List[str], k: int,
+                       filters: Optional[Dict[str, Any]] = None,
+                       query_vectors: Optional[List[List[float]]] = None) -> List[List[Document]]:
+    """
+    Nearest chunks for several queries: one embedding call for all of them (skipped
+    when the vectors are passed in) and a single multi-query Chroma request.
+    Documents carry their chunk ID.
+    """
+    if query_vectors is None:
+        query_vectors = embeddings.embed_documents(queries)
+    result = store.collection.query(
+        query_embeddings=query_vectors,
+        n_results=k,
+        where=build_chroma_where(filters),
+        include=["documents", "metadatas"]
+    )
+    return [
+        [Document(id=i, page_content=d, metadata=m or {}) for i, d, m in zip(ids, docs, metas)]
+        for ids, docs, metas in zip(result["ids"], result["documents"], result["metadatas"])
+    ]
+
+def lexical_search(store: CollectionHandle, query: str, k: int,
+                   filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+    """Best chunks by BM25 keyword score. Failures degrade to dense-only results."""
+    try:
+        return get_lexical_index().search(store.name, query, k=k, filters=filters)
+    except Exception as e:
+        logger.error(f"Lexical search failed: {e}")
+        return []
+
+async def retrieve_candidates_batch(store: CollectionHandle, queries: List[str], n: int, mode: str,
+                                    filters: Optional[Dict[str, Any]] = None,
+                                    query_vectors: Optional[List[List[float]]] = None) -> List[List[Document]]:
+    """
+    Runs the retrievers for the requested mode. In hybrid mode Chroma and the BM25
+    index are queried in parallel and merged with reciprocal rank fusion.
+    """
+    async def lexical_all(limit: int) -> List[List[Document]]:
+        return list(await asyncio.gather(*[asyncio.to_thread(lexical_search, store, q, limit, filters) for q in queries]))
+
+    if mode == "dense":
+        return await asyncio.to_thread(dense_search_batch, store, queries, n, filters, query_vectors)
+    if mode == "lexical":
+        return await lexical_all(n)
+
+    candidates = max(n, HYBRID_CANDIDATES)
+    dense_lists, lexical_lists = await asyncio.gather(
+        asyncio.to_thread(dense_search_batch, store, queries, candidates, filters, query_vectors),
+        lexical_all(candidates)
+    )
+    # With an empty keyword index the fusion simply keeps the dense ranking
+    return [reciprocal_rank_fusion([d, l], n) for d, l in zip(dense_lists, lexical_lists)]
+
+def get_chunk_vectors(store: CollectionHandle, docs: List[Document]) -> np.ndarray:
+    """Stored embeddings for retrieved chunks, in the same order (zeros if a chunk has none)."""
+    ids = [doc.id for doc in docs if doc.id]
+    stored = store.collection.get(ids=ids, include=["embeddings"]) if ids else {"ids": [], "embeddings": []}
+    by_id = dict(zip(stored["ids"], stored["embeddings"]))
+    dimension = len(stored["embeddings"][0]) if len(stored["embeddings"]) else 1
+    return np.asarray(
+        [by_id[doc.id] if doc.id in by_id else np.zeros(dimension) for doc in docs],
+        dtype=np.float32
+    )
+
+def diversify(store: CollectionHandle, docs: List[Document], k: int,
+              diversity: str = RETRIEVAL_DIVERSITY, vectors: Optional[np.ndarray] = None,
+              relevance: Optional[np.ndarray] = None) -> List[Document]:
+    """
+    Picks k distinct chunks from the candidate pool: overlapping splits and reposted
+    social content are near-identical vectors and would otherwise take several slots.
+    `relevance` (e.g. cosine scores) weighs candidates in the MMR tradeoff instead of their rank.
+    """
+    settings = diversity_settings(diversity)
+    if settings is None or len(docs) <= 1:
+        return docs[:k]
+    lambda_mult, threshold = settings
+    if vectors is None:
+        vectors = get_chunk_vectors(store, docs)
+    picked = mmr_select(vectors, k, lambda_mult=lambda_mult, duplicate_threshold=threshold, relevance=relevance)
+    logger.info(f"Diversity ({diversity}): kept {len(picked)} distinct chunks from {len(docs)} candidates.")
+    return [docs[i] for i in picked]
+
+def select_relevant(store: CollectionHandle, query: str, query_vector: List[float],
+                    docs: List[Document], k: int) -> List[Document]:
+    """
+    Scores candidates against the question, drops those under RETRIEVAL_MIN_SCORE,
+    picks up to k distinct chunks, then trims the tail after a sharp score drop
+    (adaptive k). Each returned chunk carries its `relevance_score` in metadata.
+    """
+    vectors = get_chunk_vectors(store, docs)
+    scores = cosine_scores(query_vector, vectors)
+    for doc, score in zip(docs, scores):
+        doc.metadata["relevance_score"] = round(float(score), 4)
+
+    keep = above_min_score(scores, RETRIEVAL_MIN_SCORE)
+    picked = diversify(store, [docs[i] for i in keep], k, vectors=vectors[keep], relevance=scores[keep])
+    picked_scores = [doc.metadata["relevance_score"] for doc in picked]
+    chosen_k = adaptive_k(picked_scores, k) if RETRIEVAL_ADAPTIVE_K else len(picked)
+    cutoff = sorted(picked_scores, reverse=True)[chosen_k - 1] if chosen_k else None
+
+    record_selection(query, k, len(docs), len(docs) - len(keep), picked_scores, chosen_k)
+    # Keep the MMR order; ties at the cutoff score are kept
+    return [doc for doc in picked if cutoff is not None and doc.metadata["relevance_score"] >= cutoff]
+
+def candidate_pool_size(k: int) -> int:
+    pool = k
+    if diversity_settings():
+        pool = max(pool, MMR_FETCH_K)
+    if get_scorer():
+        pool = max(pool, RERANK_CANDIDATES)
+    return pool
+
+async def finalize_candidates(store: CollectionHandle, query: str, docs: List[Document], k: int,
+                              query_vector: Optional[List[float]] = None) -> List[Document]:
+    """Per-question post-processing: rerank, then keep the k most relevant distinct chunks."""
+    docs = await rerank(query, docs)
+    if query_vector is not None and relevance_enabled():
+        return await asyncio.to_thread(select_relevant, store, query, query_vector, docs, k)
+    return await asyncio.to_thread(diversify, store, docs, k)
+
+async def search_documents_batch(queries: List[str], k: int = 5, mode: str | None = None,
+                                 filters: Optional[Dict[str, Any]] = None) -> List[List[Document]]:
+    """
+    Retrieves a candidate pool for the requested mode, optionally reranks it
+    (RERANKER), then keeps the k most relevant *distinct* chunks per question.
+    `filters` (see normalize_filters) are applied inside the retrievers.
+    Results are cached until the collection changes (see retrieval_cache);
+    only uncached questions reach the embedder and Chroma, in one batch.
+    """
+    mode = mode or VECTOR_SEARCH_MODE
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode '{mode}'. Choose one of: {', '.join(SEARCH_MODES)}")
+    if filters:
+        logger.info(f"Search filters: {filters}")
+
+    results: List[Optional[List[Document]]] = [None] * len(queries)
+    cache_keys = [retrieval_cache.key(q, k, mode, filters or {}) if RETRIEVAL_CACHE_ENABLED else None for q in queries]
+    for i, cache_key in enumerate(cache_keys):
+        if cache_key:
+            cached = retrieval_cache.get(cache_key)
+            if cached is not None:
+                results[i] = list(cached)
+
+    missing = [i for i, r in enumerate(results) if r is None]
+    if len(missing) < len(queries):
+        logger.info(f"Retrieval cache: {len(queries) - len(missing)} of {len(queries)} questions served from cache.")
+    if missing:
+        # Repeated questions in one batch are retrieved once
+        unique: Dict[str, List[int]] = {}
+        for i in missing:
+            unique.setdefault(normalize_question(queries[i]), []).append(i)
+        firsts = [positions[0] for positions in unique.values()]
+
+        # Questions are embedded once, for dense retrieval and relevance scoring alike
+        texts = [queries[i] for i in firsts]
+        query_vectors = None
+        if mode != "lexical" or relevance_enabled():
+            query_vectors = await asyncio.to_thread(embeddings.embed_documents, texts)
+
+        # Every stage reads the same version, even if a rebuild swaps it meanwhile
+        with collections.lease() as store:
+            candidates = await retrieve_candidates_batch(store, texts, candidate_pool_size(k), mode, filters, query_vectors)
+            finals = await asyncio.gather(*[
+                finalize_candidates(store, query, docs, k, query_vectors[n] if query_vectors else None)
+                for n, (query, docs) in enumerate(zip(texts, candidates))
+            ])
+        for positions, docs in zip(unique.values(), finals):
+            for i in positions:
+                results[i] = list(docs)
+            if cache_keys[positions[0]]:
+                retrieval_cache.put(cache_keys[positions[0]], tuple(docs))
+    return results
+
+async def search_documents(query: str, k: int = 5, mode: str | None = None,
+                           filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+    return (await search_documents_batch([query], k=k, mode=mode, filters=filters))[0]
+
+def format_results(docs: List[Document]) -> str:
+    """Removes exact duplicates and formats the chunks into a single string for the agent."""
+    if not docs:
+        return "No relevant information found in the vector database."
+    
+    # Deduplication logic
+    seen_contents = set()
+    unique_docs = []
+    for doc in docs:
+        content_key = doc.page_content.strip().lower() 
+        if content_key not in seen_contents:
+            seen_contents.add(content_key)
+            unique_docs.append(doc)
+        
+    return format_docs(unique_docs) 
+
+async def get_raw_chunks(query: str, k: int = 5, mode: str | None = None,
+                         filters: Optional[Dict[str, Any]] = None) -> List[DocumentResult]:
     """
     Executes the synchronous retrieval method in a separate thread.
     """
     logger.info(f"Chroma Service: Received query: {query}")
-    if not retriever:
-        logger.error("Retriever not available.")
-        return []
     
-    docs: List[Document] = await asyncio.to_thread(
-        retriever.get_relevant_documents, 
-        query, 
-        k=k
-    )
+    docs: List[Document] = await search_documents(query, k=k, mode=mode, filters=filters)
     results = []
     for doc in docs:
         results.append(
@@ -357,110 +709,115 @@ async def get_raw_chunks(query: str, k: int = 5) -> List[DocumentResult]:
         )
     return results
 
-async def get_formatted_chunks(query: str, k: int = 5) -> str:
+async def get_formatted_chunks(query: str, k: int = 5, mode: str | None = None,
+                               filters: Optional[Dict[str, Any]] = None) -> str:
     """
     Gets relevant documents, removes duplicates based on content, and formats them into a single string.
     """
     logger.info(f"Chroma Service: Received formatted query: {query}")
-    if not retriever:
-        logger.error("Retriever not available.")
-        return "Vector store retriever is not initialized."
     
-    docs: List[Document] = await asyncio.to_thread(
-        retriever.get_relevant_documents,
-        query,
-        k=k
-    )
+    docs: List[Document] = await search_documents(query, k=k, mode=mode, filters=filters)
     
     if not docs:
         logger.info("No relevant information found in the vector database.")
-        return "No relevant information found in the vector database."
-    
-    # Deduplication logic
-    seen_contents = set()
-    unique_docs = []
-    for doc in docs:
-        content_key = doc.page_content.strip().lower() 
-        if content_key not in seen_contents:
-            seen_contents.add(content_key)
-            unique_docs.append(doc)
-        
-    return format_docs(unique_docs) 
+    return format_results(docs)
+
+async def get_formatted_chunks_batch(queries: List[str], k: int = 5, mode: str | None = None,
+                                     filters: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Formatted results for many questions, retrieved with one embedding call and one Chroma query."""
+    logger.info(f"Chroma Service: Received batch of {len(queries)} queries")
+
+    results = await search_documents_batch(queries, k=k, mode=mode, filters=filters)
+    return [format_results(docs) for docs in results]
 
 # Admin service functions
 def run_chroma_ingestion() -> int:
     """
-    Loads all specified data files and ingests them into ChromaDB.
+    Builds a new version of the collection from all data files and swaps it in.
+    The current version keeps answering queries until the new one is complete and
+    validated; the old version is dropped once in-flight queries have finished.
     """
     logger.info("--- Chroma Service: Running Full Data Ingestion ---")
-    
-    website_json_path = os.path.join(DATA_DIR, "website_data.json")
-    logger.info(f"Loading website data from: {website_json_path}")
-    website_json = load_json_data(website_json_path)
-    
-    linkedin_json_path = os.path.join(DATA_DIR, "linkedin_data.json")
-    logger.info(f"Loading linkedin data from: {linkedin_json_path}")
-    linkedin_json = load_json_data(linkedin_json_path)
-
-    facebook_json_path = os.path.join(DATA_DIR, "facebook_data.json")
-    logger.info(f"Loading facebook data from: {facebook_json_path}")
-    facebook_json = load_json_data(facebook_json_path)
-
-    tiktok_json_path = os.path.join(DATA_DIR, "tiktok_data.json")
-    logger.info(f"Loading tiktok data from: {tiktok_json_path}")
-    tiktok_json = load_json_data(tiktok_json_path)
-
-    website_data = website_json.get("data", []) if isinstance(website_json, dict) else website_json
-    linkedin_data = linkedin_json.get("data", []) if isinstance(linkedin_json, dict) else linkedin_json
-    facebook_data = facebook_json.get("data", []) if isinstance(facebook_json, dict) else facebook_json
-    tiktok_data = tiktok_json.get("data", []) if isinstance(tiktok_json, dict) else tiktok_json
-
-    total_added = 0
-    
-    # Unified Ingestion calls
-    total_added += ingest_data(website_data, "website")
-    total_added += ingest_data(linkedin_data, "linkedin")
-    total_added += ingest_data(facebook_data, "facebook")
-    total_added += ingest_data(tiktok_data, "tiktok")
 
+    if not collections.build_lock.acquire(blocking=False):
+        raise RuntimeError("A Chroma ingestion or clear is already running.")
     try:
-        count_result = vector_store._collection.count()
+        live = collections.active
+        # Vectors can only be reused if the live version was built with the configured backend
+        try:
+            check_collection_embeddings(live.collection, embeddings)
+            reuse_vectors = True
+        except ValueError as e:
+            logger.warning(f"{e} Re-embedding every chunk into the new version.")
+            reuse_vectors = False
+
+        target = collections.create_version()
+        check_collection_embeddings(target.collection, embeddings)
+        try:
+            files = {source: find_data_file(source) for source in ["website", "linkedin", "facebook", "tiktok"]}
+            # Progress is measured in bytes of data files read (item counts aren't known up front)
+            total_bytes = sum(os.path.getsize(path) for path in files.values() if path)
+            report_progress(0, total_bytes, unit="bytes", message=f"Building '{target.name}'")
+            done_bytes = 0
+            expected = 0
+            # Unified Ingestion calls (each file is streamed, never loaded whole)
+            for source, file_path in files.items():
+                if not file_path:
+                    # No new data for this source: keep what is live
+                    expected += carry_over(live, target, list(get_existing_ids(live.collection, source)), reuse_vectors)
+                    continue
+                logger.info(f"Loading {source} data from: {file_path}")
+                items = iter_json_items(
+                    file_path,
+                    progress=lambda n, base=done_bytes, s=source: report_progress(base + n, message=f"Ingesting {s}")
+                )
+                expected += ingest_data(items, source, live, target, reuse_vectors)["chunks"]
+                done_bytes += os.path.getsize(file_path)
+
+            report_progress(total_bytes, message="Validating new version")
+
+            count_result = target.collection.count()
+            if count_result != expected:
+                raise RuntimeError(f"Validation failed: '{target.name}' holds {count_result} chunks, expected {expected}.")
+            if count_result == 0 and live.collection.count() > 0:
+                raise RuntimeError(f"Validation failed: '{target.name}' is empty. Keeping '{live.name}'.")
+        except BaseException:
+            # Failed or cancelled: the live version was never touched
+            collections.discard(target)
+            get_lexical_index().drop(target.name)
+            raise
+
+        old = collections.swap(target)
+        retrieval_cache.bump_generation()
+        collections.retire(old, on_dropped=get_lexical_index().drop)
+
         logger.info(f"\n--- Ingestion Complete ---")
-        logger.info(f"Total items in ChromaDB: {count_result}")
+        logger.info(f"Total items in ChromaDB: {count_result} ('{target.name}')")
         return count_result
-    except Exception as e:
-        logger.error(f"Error counting items in collection: {e}")
-        return total_added
+    finally:
+        collections.build_lock.release()
 
 def run_clear_chroma():
     """
-    Deletes all data from the 'enterprise_data' collection.
+    Empties the 'enterprise_data' collection by swapping in a new, empty version.
+    (A re-index does not need this: ingestion always builds a fresh version.)
     """
     logger.info("--- Chroma Service: Clearing 'enterprise_data' collection ---")
+    if not collections.build_lock.acquire(blocking=False):
+        raise RuntimeError("A Chroma ingestion or clear is already running.")
     try:
-        temp_vector_store = Chroma(
-            collection_name="enterprise_data",
-            embedding_function=embeddings,
-            persist_directory=CHROMA_PERSIST_DIR
-        )
-        temp_vector_store.delete_collection()
-        logger.info("Collection deleted.")
-        
-        global vector_store, retriever
-        vector_store = Chroma(
-            collection_name="enterprise_data",
-            embedding_function=embeddings,
-            persist_directory=CHROMA_PERSIST_DIR
-        )
-        retriever = vector_store.as_retriever(
-            search_type="similarity",
-            search_kwargs={"k": 5} 
-        )
+        target = collections.create_version()
+        check_collection_embeddings(target.collection, embeddings)
+        old = collections.swap(target)
+        retrieval_cache.bump_generation()
+        collections.retire(old, on_dropped=get_lexical_index().drop)
         
         logger.info("Collection re-created with new instance.")
         return "Collection 'enterprise_data' cleared and re-created successfully."
     except Exception as e:
         logger.error(f"Error clearing collection: {e}")
         raise e            
+    finally:
+        collections.build_lock.release()
 
 logger.info("ChromaDB Service file loaded.")
\ No newline at end of file
@@ -0,0 +1,65 @@
+import os
+from typing import List, Optional
+import numpy as np
+
+# IMPORT LOGGER
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# --- CONFIGURATION ---
+# RETRIEVAL_DIVERSITY:
+#   mmr   - maximal marginal relevance + near-duplicate removal (default)
+#   dedup - keep the retrieval order, only drop near-duplicates
+#   none  - return candidates as retrieved
+RETRIEVAL_DIVERSITY = os.getenv("RETRIEVAL_DIVERSITY", "mmr").strip().lower()
+# 1.0 = relevance only, 0.0 = diversity only
+MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", "0.7"))
+# Candidate pool the k results are picked from
+MMR_FETCH_K = int(os.getenv("MMR_FETCH_K", "20"))
+# Cosine similarity above which two chunks count as the same content
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.95"))
+
+def mmr_select(vectors: np.ndarray, k: int, lambda_mult: float = MMR_LAMBDA,
+               duplicate_threshold: float = NEAR_DUPLICATE_THRESHOLD,
+               relevance: Optional[np.ndarray] = None) -> List[int]:
+    """
+    Picks up to k row indices from `vectors` (candidates in retrieval order).
+    Each step takes the candidate with the best  lambda * relevance - (1 - lambda) * redundancy,
+    where redundancy is the max cosine similarity to anything already picked.
+    Candidates closer than `duplicate_threshold` to a picked one are dropped outright.
+
+    `relevance` defaults to a linear decay over the retrieval rank, so the ordering
+    produced by dense, lexical or fused retrieval is respected.
+    """
+    n = len(vectors)
+    if n == 0:
+        return []
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    unit = vectors / norms
+    similarity = unit @ unit.T
+
+    if relevance is None:
+        relevance = np.linspace(1.0, 0.0, n, endpoint=False)
+
+    selected: List[int] = []
+    redundancy = np.zeros(n, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+    while len(selected) < k and available.any():
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        redundancy = np.maximum(redundancy, similarity[best])
+        available &= redundancy < duplicate_threshold
+    return selected
+
+def diversity_settings(mode: str = RETRIEVAL_DIVERSITY) -> tuple | None:
+    """(lambda, duplicate_threshold) for a diversity mode, or None when disabled."""
+    if mode == "mmr":
+        return MMR_LAMBDA, NEAR_DUPLICATE_THRESHOLD
+    if mode == "dedup":
+        return 1.0, NEAR_DUPLICATE_THRESHOLD
+    return None
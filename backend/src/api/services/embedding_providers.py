@@ -0,0 +1,201 @@
+import os
+import re
+import hashlib
+from typing import List, Dict, Any, ClassVar, Optional
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_openai import OpenAIEmbeddings
+
+# IMPORT LOGGER
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# --- CONFIGURATION ---
+# EMBEDDING_BACKEND sets the default for every collection.
+# Override per collection with <COLLECTION_NAME>_EMBEDDING_BACKEND,
+# e.g. SEMANTIC_RESPONSE_CACHE_EMBEDDING_BACKEND=local
+#
+# EMBEDDING_DIMENSIONS / <COLLECTION_NAME>_EMBEDDING_DIMENSIONS truncate OpenAI
+# text-embedding-3 vectors (e.g. 256 or 512). Changing it requires a re-index:
+#   python src/scripts/reindex_collection.py --collection enterprise_data --dimensions 512
+#
+# Backends:
+#   openai  - OpenAI text-embedding-3-small (network call per batch)
+#   local   - all-MiniLM-L6-v2 on CPU via ONNX Runtime (no network after first download)
+#   hashing - deterministic feature hashing, for tests and offline development
+DEFAULT_EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai")
+OPENAI_EMBEDDING_MODEL = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+LOCAL_EMBEDDING_BATCH_SIZE = int(os.getenv("LOCAL_EMBEDDING_BATCH_SIZE", "64"))
+HASHING_EMBEDDING_DIMENSION = int(os.getenv("HASHING_EMBEDDING_DIMENSION", "384"))
+
+OPENAI_MODEL_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+
+# Keys written into Chroma collection metadata to record how vectors were produced
+METADATA_KEYS = ("embedding_backend", "embedding_model", "embedding_dimension")
+
+# Collections created before backends were configurable were always filled by OpenAI
+LEGACY_SIGNATURE = {
+    "embedding_backend": "openai",
+    "embedding_model": "text-embedding-3-small",
+    "embedding_dimension": 1536,
+}
+
+class HashingEmbeddings(Embeddings):
+    """
+    Deterministic bag-of-words feature hashing. Same text -> same vector,
+    on any machine, with no model or network. Not semantically strong,
+    but ideal for tests and for running the stack offline.
+    """
+    backend_name = "hashing"
+
+    def __init__(self, dimension: int = HASHING_EMBEDDING_DIMENSION):
+        self.dimension = dimension
+        self.model_name = f"blake2b-{dimension}"
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for token in re.findall(r"\w+", text.lower()):
+            digest = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+            sign = 1.0 if (digest >> 63) & 1 else -1.0
+            vector[digest % self.dimension] += sign
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+class LocalOnnxEmbeddings(Embeddings):
+    """
+    all-MiniLM-L6-v2 running on CPU through ONNX Runtime (the model Chroma ships
+    with). The model is downloaded once to ~/.cache/chroma and reused after that.
+    """
+    backend_name = "local"
+
+    def __init__(self, batch_size: int = LOCAL_EMBEDDING_BATCH_SIZE):
+        from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+        self.model_name = "all-MiniLM-L6-v2"
+        self.dimension = 384
+        self.batch_size = batch_size
+        self._model = ONNXMiniLM_L6_V2(preferred_providers=["CPUExecutionProvider"])
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors: List[List[float]] = []
+        for i in range(0, len(texts), self.batch_size):
+            batch = texts[i:i + self.batch_size]
+            vectors.extend(np.asarray(v, dtype=np.float32).tolist() for v in self._model(batch))
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+class OpenAIBackendEmbeddings(OpenAIEmbeddings):
+    """OpenAIEmbeddings tagged with a backend name so it can be described like the others."""
+    backend_name: ClassVar[str] = "openai"
+
+def _build_openai(dimensions: Optional[int] = None) -> Embeddings:
+    if dimensions and not OPENAI_EMBEDDING_MODEL.startswith("text-embedding-3"):
+        raise ValueError(f"{OPENAI_EMBEDDING_MODEL} does not support reduced dimensions.")
+    return OpenAIBackendEmbeddings(model=OPENAI_EMBEDDING_MODEL, dimensions=dimensions)
+
+def _build_local(dimensions: Optional[int] = None) -> Embeddings:
+    if dimensions and dimensions != 384:
+        raise ValueError("The local backend only produces 384-dimensional vectors.")
+    return LocalOnnxEmbeddings()
+
+def _build_hashing(dimensions: Optional[int] = None) -> Embeddings:
+    return HashingEmbeddings(dimensions or HASHING_EMBEDDING_DIMENSION)
+
+EMBEDDING_BACKENDS = {
+    "openai": _build_openai,
+    "local": _build_local,
+    "hashing": _build_hashing,
+}
+
+def backend_for_collection(collection_name: str) -> str:
+    env_key = f"{collection_name.upper()}_EMBEDDING_BACKEND"
+    return os.getenv(env_key, DEFAULT_EMBEDDING_BACKEND).strip().lower()
+
+def dimensions_for_collection(collection_name: str) -> Optional[int]:
+    env_key = f"{collection_name.upper()}_EMBEDDING_DIMENSIONS"
+    value = os.getenv(env_key, os.getenv("EMBEDDING_DIMENSIONS", "")).strip()
+    return int(value) if value else None
+
+def native_dimension(backend: str, model: str) -> Optional[int]:
+    """The dimension a backend/model produces when no reduced size is requested."""
+    if backend == "openai":
+        return OPENAI_MODEL_DIMENSIONS.get(model)
+    if backend == "local":
+        return 384
+    return HASHING_EMBEDDING_DIMENSION
+
+def get_embeddings(collection_name: str, backend: Optional[str] = None, dimensions: Optional[int] = None) -> Embeddings:
+    """
+    Builds the embedding backend configured for a given Chroma collection.
+    `backend` and `dimensions` override the environment (used by the re-index tool).
+    """
+    backend = backend or backend_for_collection(collection_name)
+    dimensions = dimensions or dimensions_for_collection(collection_name)
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{backend}' for collection '{collection_name}'. "
+                         f"Choose one of: {', '.join(EMBEDDING_BACKENDS)}")
+    logger.info(f"Embedding backend for '{collection_name}': {backend} ({dimensions or 'default'} dims)")
+    return EMBEDDING_BACKENDS[backend](dimensions)
+
+def embedding_metadata(embeddings: Embeddings) -> Dict[str, Any]:
+    """The backend/model/dimension signature stored on a collection."""
+    backend = getattr(embeddings, "backend_name", type(embeddings).__name__)
+    if backend == "openai":
+        model = embeddings.model
+        dimension = embeddings.dimensions or OPENAI_MODEL_DIMENSIONS.get(model, 0)
+    else:
+        model = embeddings.model_name
+        dimension = embeddings.dimension
+    return {
+        "embedding_backend": backend,
+        "embedding_model": model,
+        "embedding_dimension": dimension,
+    }
+
+def check_collection_embeddings(collection, embeddings: Embeddings) -> None:
+    """
+    Ensures a Chroma collection only ever holds vectors from one backend.
+    Unstamped collections are stamped (empty ones with the current backend,
+    populated ones as legacy OpenAI). Raises ValueError on a mismatch.
+    """
+    expected = embedding_metadata(embeddings)
+    current = dict(collection.metadata or {})
+    recorded = {key: current.get(key) for key in METADATA_KEYS}
+
+    if all(value is None for value in recorded.values()):
+        recorded = expected if collection.count() == 0 else LEGACY_SIGNATURE
+        # Chroma refuses metadata updates that mention the distance function
+        preserved = {k: v for k, v in current.items() if not k.startswith("hnsw:")}
+        collection.modify(metadata={**preserved, **recorded})
+        logger.info(f"Stamped collection '{collection.name}' with embedding signature {recorded}")
+
+    if recorded != expected:
+        raise ValueError(
+            f"Collection '{collection.name}' was built with {recorded} but the configured backend is "
+            f"{expected}. Re-index the collection or change the embedding configuration."
+        )
+
+def truncate_embeddings(vectors, dimensions: int) -> np.ndarray:
+    """
+    Shortens text-embedding-3 vectors to `dimensions` and re-normalizes them.
+    Equivalent to requesting `dimensions` from the API, without re-embedding.
+    """
+    matrix = np.asarray(vectors, dtype=np.float32)[:, :dimensions]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
@@ -0,0 +1,106 @@
+import os
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, List, Iterable
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.api.services.embedding_providers import embedding_metadata
+
+# IMPORT LOGGER
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Persistent (model, dimension, sha256(text)) -> vector store consulted before
+# calling the embedding backend, so rebuilding a collection only pays for new text.
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.join(script_dir, '..', '..', '..')
+EMBEDDING_CACHE_PATH = os.getenv(
+    "EMBEDDING_CACHE_PATH",
+    os.path.join(project_root, 'embedding_cache', 'embeddings.sqlite3')
+)
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+
+# Stay well under SQLite's bound-parameter limit
+_LOOKUP_CHUNK = 500
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def model_key(embeddings: Embeddings) -> tuple:
+    signature = embedding_metadata(embeddings)
+    return f"{signature['embedding_backend']}:{signature['embedding_model']}", int(signature["embedding_dimension"])
+
+class EmbeddingStore:
+    """SQLite-backed embedding cache. Safe to share between ingestion worker threads."""
+
+    def __init__(self, path: str = EMBEDDING_CACHE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                dimension INTEGER NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, dimension, text_hash)
+            ) WITHOUT ROWID
+        """)
+        self._conn.commit()
+
+    def get_many(self, model: str, dimension: int, hashes: Iterable[str]) -> Dict[str, List[float]]:
+        hashes = list(dict.fromkeys(hashes))
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            for i in range(0, len(hashes), _LOOKUP_CHUNK):
+                chunk = hashes[i:i + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND dimension = ? AND text_hash IN ({placeholders})",
+                    [model, dimension, *chunk]
+                ).fetchall()
+                for h, blob in rows:
+                    found[h] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def put_many(self, model: str, dimension: int, vectors: Dict[str, List[float]]):
+        if not vectors:
+            return
+        rows = [
+            (model, dimension, h, np.asarray(v, dtype=np.float32).tobytes())
+            for h, v in vectors.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, dimension, text_hash, vector) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_embedding_store() -> EmbeddingStore | None:
+    """Lazily opens the shared store; returns None when the cache is disabled or unavailable."""
+    global _store
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    with _store_lock:
+        if _store is None:
+            try:
+                _store = EmbeddingStore()
+                logger.info(f"Embedding cache opened at {EMBEDDING_CACHE_PATH}")
+            except Exception as e:
+                logger.error(f"Could not open embedding cache, embedding everything: {e}")
+                return None
+        return _store
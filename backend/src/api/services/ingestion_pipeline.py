@@ -0,0 +1,250 @@
+import os
+import json
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Iterator, Callable, Optional
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from src.api.services.embedding_store import get_embedding_store, model_key, text_hash
+
+# IMPORT LOGGER
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# --- CONFIGURATION ---
+INGEST_EMBED_BATCH_SIZE = int(os.getenv("INGEST_EMBED_BATCH_SIZE", "100"))
+INGEST_EMBED_CONCURRENCY = int(os.getenv("INGEST_EMBED_CONCURRENCY", "4"))
+# Upper bound on embedding API requests started per second (across all workers)
+INGEST_EMBED_REQUESTS_PER_SECOND = float(os.getenv("INGEST_EMBED_REQUESTS_PER_SECOND", "5"))
+INGEST_EMBED_MAX_RETRIES = int(os.getenv("INGEST_EMBED_MAX_RETRIES", "5"))
+INGEST_EMBED_BACKOFF_SECONDS = float(os.getenv("INGEST_EMBED_BACKOFF_SECONDS", "1.0"))
+# Chunks held in memory before being flushed to the embedder and Chroma
+INGEST_STREAM_BATCH_SIZE = int(os.getenv("INGEST_STREAM_BATCH_SIZE", str(INGEST_EMBED_BATCH_SIZE * INGEST_EMBED_CONCURRENCY * 2)))
+
+# --- STREAMING JSON READER ---
+_READ_SIZE = 64 * 1024
+_decoder = json.JSONDecoder()
+
+class _JsonStreamReader:
+    """Decodes one JSON value at a time from a file, keeping only a small window in memory."""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        # Grow the read size with the pending window so huge values don't re-parse quadratically
+        chunk = self.f.read(max(_READ_SIZE, len(self.buf) - self.pos))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of file)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expected '{char}'", self.buf, self.pos)
+        self.pos += 1
+
+    def decode(self) -> Any:
+        while True:
+            self.peek()
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number ending exactly at the window edge may continue in the next read
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def iter_array(self) -> Iterator[Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.decode()
+            char = self.peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise json.JSONDecodeError("Expected ',' or ']'", self.buf, self.pos - 1)
+
+def iter_json_items(file_path: str, progress: Optional[Callable[[int], None]] = None) -> Iterator[Any]:
+    """
+    Streams items from a scraped data file without loading it whole:
+    - *.jsonl: one item per line
+    - *.json:  a top-level list, or an object whose "data" key holds the list
+    `progress`, if given, receives the number of bytes read so far after each item.
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        def tracked(items: Iterator[Any]) -> Iterator[Any]:
+            for item in items:
+                yield item
+                if progress:
+                    progress(f.buffer.tell())
+
+        if file_path.endswith(".jsonl"):
+            yield from tracked(json.loads(line) for line in f if line.strip())
+            return
+
+        reader = _JsonStreamReader(f)
+        first = reader.peek()
+        if first == "[":
+            yield from tracked(reader.iter_array())
+        elif first == "{":
+            reader.pos += 1
+            while reader.peek() not in ("}", ""):
+                key = reader.decode()
+                reader.expect(":")
+                if key == "data" and reader.peek() == "[":
+                    yield from tracked(reader.iter_array())
+                    return
+                reader.decode()  # skip other top-level values
+                if reader.peek() == ",":
+                    reader.pos += 1
+        elif first:
+            raise json.JSONDecodeError("Expected a JSON list or object", reader.buf, reader.pos)
+
+class RateLimiter:
+    """Spaces out calls so that at most `rate` start per second, shared across threads."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+def embed_with_retry(embeddings: Embeddings, texts: List[str], limiter: RateLimiter) -> List[List[float]]:
+    """Embeds one batch, retrying with exponential backoff and jitter on failure."""
+    for attempt in range(INGEST_EMBED_MAX_RETRIES + 1):
+        limiter.acquire()
+        try:
+            return embeddings.embed_documents(texts)
+        except Exception as e:
+            if attempt == INGEST_EMBED_MAX_RETRIES:
+                raise
+            delay = min(INGEST_EMBED_BACKOFF_SECONDS * (2 ** attempt), 30.0) * (0.5 + random.random())
+            logger.warning(f"Embedding batch of {len(texts)} failed ({e}). Retry {attempt + 1} in {delay:.1f}s...")
+            time.sleep(delay)
+
+def _clean_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    # Chroma only stores scalar values; missing engagement counts are simply omitted
+    return {k: v for k, v in metadata.items() if v is not None}
+
+def _upsert(collection, ids: List[str], documents: List[Document], vectors: List[List[float]]):
+    collection.upsert(
+        ids=ids,
+        embeddings=vectors,
+        documents=[d.page_content for d in documents],
+        metadatas=[_clean_metadata(d.metadata) for d in documents]
+    )
+
+def copy_chunks(collection, ids: List[str], documents: List[Document], vectors: List[List[float]]):
+    """Writes chunks whose vectors are already known (e.g. from the previous collection version)."""
+    for b in range(0, len(ids), INGEST_EMBED_BATCH_SIZE):
+        _upsert(collection, ids[b:b + INGEST_EMBED_BATCH_SIZE], documents[b:b + INGEST_EMBED_BATCH_SIZE],
+                vectors[b:b + INGEST_EMBED_BATCH_SIZE])
+
+def write_chunks(collection, embeddings: Embeddings, ids: List[str], documents: List[Document],
+                 batch_size: int = INGEST_EMBED_BATCH_SIZE,
+                 concurrency: int = INGEST_EMBED_CONCURRENCY) -> Dict[str, Any]:
+    """
+    Embeds chunks in concurrent batches (rate limited, retried) and upserts
+    each batch into the Chroma collection as soon as its vectors arrive.
+    Vectors already in the on-disk embedding cache are reused without an API call.
+    """
+    if not ids:
+        return {"written": 0, "cache_hits": 0, "failed": 0, "elapsed_seconds": 0.0, "chunks_per_second": 0.0}
+
+    start = time.perf_counter()
+    written = 0
+    failed = 0
+
+    # 1. Reuse cached vectors for text we have embedded before
+    store = get_embedding_store()
+    model, dimension = model_key(embeddings) if store else (None, None)
+    hashes = [text_hash(d.page_content) for d in documents]
+    cached = store.get_many(model, dimension, hashes) if store else {}
+
+    pending = [(i, d, h) for i, d, h in zip(ids, documents, hashes) if h not in cached]
+    hits = [(i, d, h) for i, d, h in zip(ids, documents, hashes) if h in cached]
+    for b in range(0, len(hits), batch_size):
+        batch = hits[b:b + batch_size]
+        _upsert(collection, [i for i, _, _ in batch], [d for _, d, _ in batch], [cached[h] for _, _, h in batch])
+        written += len(batch)
+    if store:
+        logger.info(f"Embedding cache: {len(hits)} hits, {len(pending)} chunks to embed.")
+
+    # 2. Embed the rest concurrently
+    limiter = RateLimiter(INGEST_EMBED_REQUESTS_PER_SECOND)
+    batches = [pending[b:b + batch_size] for b in range(0, len(pending), batch_size)]
+    if batches:
+        logger.info(f"Embedding {len(pending)} chunks in {len(batches)} batches (concurrency {concurrency})...")
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {
+            pool.submit(embed_with_retry, embeddings, [d.page_content for _, d, _ in batch], limiter): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                vectors = future.result()
+            except Exception as e:
+                failed += len(batch)
+                logger.error(f"Embedding batch of {len(batch)} chunks gave up after retries: {e}")
+                continue
+
+            # Writes happen on this thread only, so Chroma never sees concurrent upserts
+            _upsert(collection, [i for i, _, _ in batch], [d for _, d, _ in batch], vectors)
+            if store:
+                store.put_many(model, dimension, {h: v for (_, _, h), v in zip(batch, vectors)})
+            written += len(batch)
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "written": written,
+        "cache_hits": len(hits),
+        "failed": failed,
+        "elapsed_seconds": round(elapsed, 2),
+        "chunks_per_second": round(written / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+    logger.info(f"Embedding pipeline: {written} chunks in {stats['elapsed_seconds']}s "
+                f"({stats['chunks_per_second']} chunks/sec), {len(hits)} from cache, {failed} failed.")
+
+    if failed:
+        # The caller discards the whole target version; the next run rebuilds into a new one
+        raise RuntimeError(f"{failed} of {len(ids)} chunks could not be embedded.")
+    return stats
@@ -0,0 +1,210 @@
+import os
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+# IMPORT LOGGER
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# --- CONFIGURATION ---
+# Admin maintenance (ingestion, clearing) runs on these worker threads, never on the event loop.
+# Threads rather than processes: jobs swap in-process state (active collection, caches).
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# Finished jobs kept for the status endpoints
+JOB_HISTORY_SIZE = int(os.getenv("JOB_HISTORY_SIZE", "50"))
+
+class JobCancelled(BaseException):
+    """
+    Raised inside a job at its next progress checkpoint after cancellation was requested.
+    A BaseException (like asyncio.CancelledError) so `except Exception` blocks don't swallow it.
+    """
+
+class JobConflict(Exception):
+    """A job of the same conflict group is already queued or running."""
+
+    def __init__(self, job: "Job"):
+        super().__init__(f"A '{job.kind}' job is already {job.status} ({job.id}).")
+        self.job = job
+
+class JobNotCancellable(Exception):
+    """The job is in a step that replaces live data in place and cannot be interrupted."""
+
+    def __init__(self, job: "Job"):
+        super().__init__(f"Job {job.id} ({job.kind}) cannot be cancelled now: {job.message or 'critical step'}.")
+        self.job = job
+
+class Job:
+    def __init__(self, kind: str, group: Optional[str] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        # Jobs touching the same data store share a group and never run concurrently
+        self.group = group or kind
+        self.status = "queued"  # queued | running | succeeded | failed | cancelled
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.processed = 0
+        self.total: Optional[int] = None
+        self.unit = "items"
+        self.message = ""
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.cancel_requested = threading.Event()
+        # False inside non_cancellable() sections; guarded by _lock against a racing cancel()
+        self.cancellable = True
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def eta_seconds(self) -> Optional[float]:
+        if self.status != "running" or not self.total or not self.processed or not self.started_at:
+            return None
+        elapsed = time.time() - self.started_at
+        return round(elapsed / self.processed * max(self.total - self.processed, 0), 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        end = self.finished_at or time.time()
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "group": self.group,
+            "status": self.status,
+            "message": self.message,
+            "processed": self.processed,
+            "total": self.total,
+            "unit": self.unit,
+            "percent": round(100 * self.processed / self.total, 1) if self.total else None,
+            "eta_seconds": self.eta_seconds(),
+            "elapsed_seconds": round(end - self.started_at, 1) if self.started_at else 0.0,
+            "cancel_requested": self.cancel_requested.is_set(),
+            "cancellable": self.cancellable,
+            "result": self.result,
+            "error": self.error,
+        }
+
+# The job running on the current worker thread (None outside jobs)
+_current = threading.local()
+
+def report_progress(processed: Optional[int] = None, total: Optional[int] = None,
+                    unit: Optional[str] = None, message: Optional[str] = None):
+    """
+    Progress checkpoint for long-running service code. Updates the current job and
+    raises JobCancelled if it was cancelled. A no-op when not running as a job
+    (scripts, tests), so service functions can call it unconditionally.
+    """
+    job: Optional[Job] = getattr(_current, "job", None)
+    if job is None:
+        return
+    if processed is not None:
+        job.processed = processed
+    if total is not None:
+        job.total = total
+    if unit is not None:
+        job.unit = unit
+    if message is not None:
+        job.message = message
+    if job.cancellable and job.cancel_requested.is_set():
+        raise JobCancelled()
+
+@contextmanager
+def non_cancellable(message: Optional[str] = None):
+    """
+    Marks a step that modifies live data in place (e.g. wipe-and-reload) so it is not
+    interrupted halfway. A cancel requested before the step still stops the job on entry;
+    during the step, cancel() is rejected with JobNotCancellable.
+    """
+    job: Optional[Job] = getattr(_current, "job", None)
+    if job is None:
+        yield
+        return
+    report_progress(message=message)
+    with job._lock:
+        if job.cancel_requested.is_set():
+            raise JobCancelled()
+        job.cancellable = False
+    try:
+        yield
+    finally:
+        job.cancellable = True
+
+class JobRunner:
+    def __init__(self, workers: int = JOB_WORKERS, history: int = JOB_HISTORY_SIZE):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._history = history
+
+    def submit(self, kind: str, fn: Callable[[], Any], group: Optional[str] = None) -> Job:
+        """
+        Queues `fn` as a job. Only one job per conflict group (default: its kind) may be
+        queued or running at a time, e.g. clearing Neo4j while it is being reloaded is refused.
+        """
+        group = group or kind
+        with self._lock:
+            for existing in self._jobs.values():
+                if existing.group == group and existing.active:
+                    raise JobConflict(existing)
+            job = Job(kind, group)
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, fn)
+        logger.info(f"Job {job.id} ({kind}) queued.")
+        return job
+
+    def _run(self, job: Job, fn: Callable[[], Any]):
+        if job.cancel_requested.is_set():
+            job.status, job.finished_at = "cancelled", time.time()
+            return
+        job.status, job.started_at = "running", time.time()
+        _current.job = job
+        try:
+            job.result = fn()
+            job.status, job.message = "succeeded", "Completed"
+            if job.total:
+                job.processed = job.total
+            logger.info(f"✅ Job {job.id} ({job.kind}) finished in {time.time() - job.started_at:.1f}s.")
+        except JobCancelled:
+            job.status, job.message = "cancelled", "Cancelled"
+            logger.info(f"Job {job.id} ({job.kind}) cancelled.")
+        except Exception as e:
+            job.status, job.message, job.error = "failed", "Failed", str(e)
+            logger.error(f"❌ Job {job.id} ({job.kind}) failed: {e}", exc_info=True)
+        finally:
+            job.finished_at = time.time()
+            _current.job = None
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if not job.active]
+        for job_id in finished[:max(0, len(finished) - self._history)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Requests cancellation; the job stops at its next progress checkpoint.
+        Raises JobNotCancellable while the job is inside a non_cancellable() step.
+        """
+        job = self._jobs.get(job_id)
+        if job and job.active:
+            with job._lock:
+                if not job.cancellable:
+                    raise JobNotCancellable(job)
+                job.cancel_requested.set()
+                job.message = "Cancelling..."
+        return job
+
+job_runner = JobRunner()
@@ -0,0 +1,180 @@
+import os
+import re
+import json
+import sqlite3
+import threading
+from typing import List, Dict, Iterable, Optional
+from langchain_core.documents import Document
+
+# IMPORT LOGGER
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# BM25 keyword index over the same chunks stored in Chroma (SQLite FTS5).
+# Catches exact terms dense vectors miss: plan names, package codes, phone numbers.
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.join(script_dir, '..', '..', '..')
+LEXICAL_INDEX_PATH = os.getenv(
+    "LEXICAL_INDEX_PATH",
+    os.path.join(project_root, 'chroma_data', 'lexical_index.sqlite3')
+)
+
+_BATCH = 500
+
+# Words that would match nearly every chunk and only add noise to BM25
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for", "from", "how",
+    "i", "in", "is", "it", "me", "my", "of", "on", "or", "the", "to", "what", "when", "where",
+    "which", "who", "why", "with", "you", "your", "we", "our", "there", "about", "tell", "show",
+}
+
+def _table(collection_name: str) -> str:
+    return "lex_" + re.sub(r"[^a-zA-Z0-9_]", "_", collection_name)
+
+def build_match_query(question: str) -> str | None:
+    """Turns a free-text question into an FTS5 OR query of quoted terms."""
+    terms = [t for t in re.findall(r"\w+", question.lower()) if t not in STOPWORDS]
+    if not terms:
+        return None
+    return " OR ".join(f'"{t}"' for t in dict.fromkeys(terms))
+
+def _filter_sql(filters: Dict) -> tuple:
+    conditions, params = [], []
+    if filters.get("sources"):
+        conditions.append(f"d.source IN ({','.join('?' * len(filters['sources']))})")
+        params.extend(filters["sources"])
+    if filters.get("engagement_type"):
+        conditions.append("json_extract(d.metadata, '$.engagement_type') = ?")
+        params.append(filters["engagement_type"])
+    if filters.get("ts_from") is not None:
+        conditions.append("json_extract(d.metadata, '$.post_timestamp') >= ?")
+        params.append(filters["ts_from"])
+    if filters.get("ts_to") is not None:
+        conditions.append("json_extract(d.metadata, '$.post_timestamp') <= ?")
+        params.append(filters["ts_to"])
+    return "".join(f" AND {c}" for c in conditions), params
+
+class LexicalIndex:
+    """One FTS5 table pair per Chroma collection. Safe to share between threads."""
+
+    def __init__(self, path: str = LEXICAL_INDEX_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._ready = set()
+
+    def _ensure(self, collection_name: str) -> str:
+        table = _table(collection_name)
+        if table in self._ready:
+            return table
+        self._conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS {table}_docs (
+                id INTEGER PRIMARY KEY,
+                chunk_id TEXT UNIQUE NOT NULL,
+                source TEXT,
+                metadata TEXT,
+                content TEXT
+            );
+            CREATE INDEX IF NOT EXISTS {table}_source_idx ON {table}_docs(source);
+            CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5(
+                content, content='{table}_docs', content_rowid='id'
+            );
+            CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON {table}_docs BEGIN
+                INSERT INTO {table}_fts(rowid, content) VALUES (new.id, new.content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON {table}_docs BEGIN
+                INSERT INTO {table}_fts({table}_fts, rowid, content) VALUES ('delete', old.id, old.content);
+            END;
+        """)
+        self._ready.add(table)
+        return table
+
+    def add(self, collection_name: str, ids: List[str], documents: List[Document]):
+        """Adds chunks. IDs are content-addressed, so for a known ID only the metadata is refreshed."""
+        rows = [
+            (chunk_id, doc.metadata.get("source"), json.dumps(doc.metadata, default=str), doc.page_content)
+            for chunk_id, doc in zip(ids, documents)
+        ]
+        with self._lock:
+            table = self._ensure(collection_name)
+            self._conn.executemany(
+                f"INSERT INTO {table}_docs (chunk_id, source, metadata, content) VALUES (?, ?, ?, ?) "
+                f"ON CONFLICT(chunk_id) DO UPDATE SET metadata = excluded.metadata",
+                rows
+            )
+            self._conn.commit()
+
+    def delete(self, collection_name: str, ids: Iterable[str]):
+        ids = list(ids)
+        with self._lock:
+            table = self._ensure(collection_name)
+            for i in range(0, len(ids), _BATCH):
+                chunk = ids[i:i + _BATCH]
+                self._conn.execute(
+                    f"DELETE FROM {table}_docs WHERE chunk_id IN ({','.join('?' * len(chunk))})", chunk
+                )
+            self._conn.commit()
+
+    def get_ids(self, collection_name: str, source: str) -> set:
+        with self._lock:
+            table = self._ensure(collection_name)
+            rows = self._conn.execute(f"SELECT chunk_id FROM {table}_docs WHERE source = ?", (source,)).fetchall()
+        return {r[0] for r in rows}
+
+    def drop(self, collection_name: str):
+        table = _table(collection_name)
+        with self._lock:
+            self._conn.executescript(f"""
+                DROP TABLE IF EXISTS {table}_fts;
+                DROP TABLE IF EXISTS {table}_docs;
+            """)
+            self._ready.discard(table)
+
+    def search(self, collection_name: str, question: str, k: int = 5,
+               filters: Optional[Dict] = None) -> List[Document]:
+        """
+        Top-k chunks by BM25. Each Document carries its Chroma chunk ID in `id`.
+        `filters` uses the same keys as db_service.normalize_filters.
+        """
+        match = build_match_query(question)
+        if not match:
+            return []
+        conditions, params = _filter_sql(filters or {})
+        with self._lock:
+            table = self._ensure(collection_name)
+            rows = self._conn.execute(f"""
+                SELECT d.chunk_id, d.metadata, d.content
+                FROM {table}_fts JOIN {table}_docs d ON d.id = {table}_fts.rowid
+                WHERE {table}_fts MATCH ?{conditions}
+                ORDER BY bm25({table}_fts)
+                LIMIT ?
+            """, (match, *params, k)).fetchall()
+        return [Document(id=chunk_id, page_content=content, metadata=json.loads(metadata)) for chunk_id, metadata, content in rows]
+
+_index: Optional[LexicalIndex] = None
+_index_lock = threading.Lock()
+
+def get_lexical_index() -> LexicalIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = LexicalIndex()
+            logger.info(f"Lexical index opened at {LEXICAL_INDEX_PATH}")
+        return _index
+
+def reciprocal_rank_fusion(result_lists: List[List[Document]], k: int, rrf_k: int = 60) -> List[Document]:
+    """
+    Merges ranked lists by summing 1 / (rrf_k + rank) per document ID.
+    Documents found by several retrievers rise to the top.
+    """
+    scores: Dict[str, float] = {}
+    docs: Dict[str, Document] = {}
+    for results in result_lists:
+        for rank, doc in enumerate(results, start=1):
+            key = doc.id or doc.page_content
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+            docs.setdefault(key, doc)
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    return [docs[key] for key in ranked[:k]]
@@ -1,11 +1,18 @@
 import os
+import re
+import asyncio
 import csv
+import time
+import hashlib
+import threading
 from sqlalchemy import text
 from dotenv import load_dotenv
-from neo4j import GraphDatabase
-from langchain_neo4j import Neo4jGraph, GraphCypherQAChain
+from neo4j import GraphDatabase, AsyncGraphDatabase
+from neo4j.exceptions import ServiceUnavailable, SessionExpired
+from langchain_neo4j import Neo4jGraph
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
+from langchain_core.output_parsers import StrOutputParser
 
 # IMPORT LOGGER
 from src.utils.logging_config import get_logger
@@ -13,6 +20,9 @@ from src.utils.logging_config import get_logger
 # IMPORT SQL DATABASE (For seeding)
 from src.api.db.sessions import SessionLocal
 from src.api.db.models import Product, Order, OrderItem
+from src.api.services.job_runner import report_progress, non_cancellable
+from src.api.services.cypher_cache import cypher_cache, CYPHER_CACHE_ENABLED
+from src.api.services import cypher_templates
 
 logger = get_logger(__name__)
 
@@ -21,6 +31,14 @@ NEO4J_URI = os.getenv("NEO4J_URI")
 NEO4J_USER = os.getenv("NEO4J_USER")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# CSV rows sent to Neo4j per UNWIND write transaction
+NEO4J_INGEST_BATCH_SIZE = int(os.getenv("NEO4J_INGEST_BATCH_SIZE", "500"))
+# Schema refreshes requested by admin edits are coalesced: one refresh runs once edits
+# have been quiet for the debounce window, and at the latest after the max delay
+SCHEMA_REFRESH_DEBOUNCE_SECONDS = float(os.getenv("SCHEMA_REFRESH_DEBOUNCE_SECONDS", "2"))
+SCHEMA_REFRESH_MAX_DELAY_SECONDS = float(os.getenv("SCHEMA_REFRESH_MAX_DELAY_SECONDS", "10"))
+# Rows handed to the answer prompt (same as GraphCypherQAChain's default)
+CYPHER_TOP_K = int(os.getenv("CYPHER_TOP_K", "10"))
 
 # --- PATH FIX ---
 # Current file: /app/src/api/services/neo4j_service.py
@@ -34,7 +52,8 @@ CSV_PATH = os.path.join(app_dir, 'data', 'products.csv')
 
 # Initialize variables
 graph = None
-neo4j_qa_chain = None
+cypher_generation_chain = None
+qa_chain = None
 neo4j_available = False
 llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
 
@@ -68,25 +87,21 @@ try:
     **Indexes:** 'product_name_index' on (:Product).name
     
     **SEARCH RULES:**
-    1. Specific Product Search: `CALL db.index.fulltext.queryNodes("product_name_index", "term~") YIELD node AS p RETURN p.name, p.price, p.url LIMIT 10`
-    2. Category Search: `MATCH (c:Category)<-[:IN_CATEGORY]-(p:Product) WHERE toLower(c.name) CONTAINS toLower("core_keyword") RETURN p.name, p.price, p.url LIMIT 10`
+    1. Specific Product Search: `CALL db.index.fulltext.queryNodes("product_name_index", "term~") YIELD node AS p RETURN p.name, p.price, p.url, p.sku LIMIT 10`
+    2. Category Search: `MATCH (c:Category)<-[:IN_CATEGORY]-(p:Product) WHERE toLower(c.name) CONTAINS toLower("core_keyword") RETURN p.name, p.price, p.url, p.sku LIMIT 10`
        *CRITICAL RULE:* For category searches, extract ONLY the core category noun. Do NOT use literal long phrases. (e.g., Use "smart home" instead of "smart home devices", use "router" instead of "routers").
-    3. Broad Search: `MATCH (p:Product) RETURN p.name, p.price, p.url LIMIT 10`
-    4. Return Fields: Always return `p.name`, `p.price`, and `p.url`.
+    3. Broad Search: `MATCH (p:Product) RETURN p.name, p.price, p.url, p.sku LIMIT 10`
+    4. Return Fields: Always return `p.name`, `p.price`, `p.url`, and `p.sku`.
     
     Q: "{question}"
     Cypher Query:
     """
     CYPHER_PROMPT = PromptTemplate(input_variables=["schema", "question"], template=CYPHER_GENERATION_TEMPLATE)
 
-    neo4j_qa_chain = GraphCypherQAChain.from_llm(
-        llm=llm,
-        graph=graph,
-        verbose=True,
-        allow_dangerous_requests=True,
-        qa_prompt=QA_PROMPT,
-        cypher_prompt=CYPHER_PROMPT
-    )
+    # Generation, validation, execution and answering run as separate steps
+    # (see run_graph_query) so generated Cypher can be cached.
+    cypher_generation_chain = CYPHER_PROMPT | llm | StrOutputParser()
+    qa_chain = QA_PROMPT | llm | StrOutputParser()
     neo4j_available = True
     logger.info("Neo4j Service Initialized.")
 
@@ -94,11 +109,120 @@ except Exception as e:
     logger.warning(f"Neo4j connection failed: {e}")
     neo4j_available = False
 
+# --- SHARED DRIVER ---
+# One connection pool for the whole process (opened by the app lifespan, or on first use)
+# instead of a new driver and TLS handshake per admin call.
+_driver = None
+_driver_lock = threading.Lock()
+
+def get_driver():
+    global _driver
+    with _driver_lock:
+        if _driver is None:
+            _driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+            logger.info("Neo4j driver created.")
+        return _driver
+
+def close_driver():
+    global _driver
+    schema_refresher.cancel()
+    with _driver_lock:
+        if _driver is not None:
+            _driver.close()
+            _driver = None
+            logger.info("Neo4j driver closed.")
+
+# Async driver for the request path (/db/graph/query), so graph queries don't block the event loop.
+# Created on first use inside the running loop, closed by the app lifespan.
+_async_driver = None
+
+def get_async_driver():
+    global _async_driver
+    if _async_driver is None:
+        _async_driver = AsyncGraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+        logger.info("Neo4j async driver created.")
+    return _async_driver
+
+async def close_async_driver():
+    global _async_driver
+    if _async_driver is not None:
+        await _async_driver.close()
+        _async_driver = None
+        logger.info("Neo4j async driver closed.")
+
+# --- SCHEMA REFRESH ---
+class SchemaRefresher:
+    """Debounces graph.refresh_schema() so a burst of admin edits costs one refresh."""
+
+    def __init__(self, debounce: float = SCHEMA_REFRESH_DEBOUNCE_SECONDS,
+                 max_delay: float = SCHEMA_REFRESH_MAX_DELAY_SECONDS):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._timer = None
+        self._first_request = None
+
+    def request(self):
+        """Schedules a refresh; requests arriving before it runs are folded into it."""
+        with self._lock:
+            now = time.monotonic()
+            if self._timer is None:
+                self._first_request = now
+            else:
+                self._timer.cancel()
+            delay = min(self.debounce, max(self._first_request + self.max_delay - now, 0))
+            self._timer = threading.Timer(delay, self.refresh_now)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = None
+
+    def refresh_now(self):
+        """Refreshes immediately (bulk loads), superseding any pending request."""
+        self.cancel()
+        if not neo4j_available:
+            return
+        try:
+            graph.refresh_schema()
+            logger.info("Neo4j schema refreshed.")
+        except Exception as e:
+            logger.error(f"Neo4j schema refresh failed: {e}")
+
+schema_refresher = SchemaRefresher()
+
+def schema_covers(label: str, properties, relationships=()) -> bool:
+    """True if the cached schema already lists the label, its properties and the relationship types."""
+    if not neo4j_available:
+        return False
+    schema = graph.get_structured_schema or {}
+    known_props = {prop["property"] for prop in schema.get("node_props", {}).get(label, [])}
+    known_rels = {rel["type"] for rel in schema.get("relationships", [])}
+    return set(properties) <= known_props and set(relationships) <= known_rels
+
+BATCH_INGEST_QUERY = """
+UNWIND $rows AS row
+MERGE (c:Category {name: row.category})
+MERGE (p:Product {sku: row.sku})
+ON CREATE SET 
+    p.name = row.name, 
+    p.price = toFloat(row.price),
+    p.url = row.url,
+    p.image_url = row.image_url
+MERGE (p)-[:IN_CATEGORY]->(c)
+"""
+
 class Neo4jIngestor:
-    def __init__(self, uri, user, password):
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+    def __init__(self, uri, user, password, driver=None):
+        # A passed-in (shared) driver is borrowed and left open on close()
+        self._owns_driver = driver is None
+        self.driver = driver or GraphDatabase.driver(uri, auth=(user, password))
     def close(self):
-        self.driver.close()
+        if self._owns_driver:
+            self.driver.close()
     
     def setup_constraints(self):
         with self.driver.session(database="neo4j") as session:
@@ -110,39 +234,70 @@ class Neo4jIngestor:
         with self.driver.session(database="neo4j") as session:
             session.run("MATCH (n) DETACH DELETE n")
             
-    def ingest_csv(self, file_path):
+    @staticmethod
+    def _write_batch(tx, rows):
+        tx.run(BATCH_INGEST_QUERY, rows=rows).consume()
+
+    def _write_rows(self, session, rows) -> int:
+        """
+        Writes rows as one batch. A batch that still fails after the driver's retries
+        is split in half and each half retried, down to single rows, so one bad row
+        only drops itself. Returns the number of rows written. Losing the connection
+        is not a row problem and aborts the ingestion instead.
+        """
+        try:
+            session.execute_write(self._write_batch, rows)
+            return len(rows)
+        except (ServiceUnavailable, SessionExpired):
+            raise
+        except Exception as e:
+            if len(rows) == 1:
+                logger.error(f"Neo4j Row Error (sku {rows[0].get('sku')} skipped): {e}")
+                return 0
+            logger.warning(f"Neo4j Batch Error ({len(rows)} rows), retrying in smaller batches: {e}")
+        middle = len(rows) // 2
+        return self._write_rows(session, rows[:middle]) + self._write_rows(session, rows[middle:])
+
+    def ingest_csv(self, file_path, batch_size: int = NEO4J_INGEST_BATCH_SIZE):
+        """
+        Streams the CSV in batches of `batch_size` rows; each batch is one
+        UNWIND statement in its own write transaction (retried on transient errors).
+        """
         if not os.path.exists(file_path):
             logger.error(f"CSV not found at {file_path}")
             return 0
 
-        ingest_query = """
-        MERGE (c:Category {name: $category})
-        MERGE (p:Product {sku: $sku})
-        ON CREATE SET 
-            p.name = $name, 
-            p.price = toFloat($price),
-            p.url = $url,
-            p.image_url = $image_url
-        MERGE (p)-[:IN_CATEGORY]->(c)
-        """
-        count = 0
         with open(file_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            with self.driver.session(database="neo4j") as session:
-                for row in reader:
-                    try:
-                        params = {
-                            "category": row.get('category', 'Uncategorized'), 
-                            "sku": row['sku'],
-                            "name": row['name'],
-                            "price": float(row.get('price', 0)),
-                            "url": row.get('product_url', ''), 
-                            "image_url": row.get('image_url', '')
-                        }
-                        session.run(ingest_query, **params)
-                        count += 1
-                    except Exception as e:
-                        logger.error(f"Neo4j Row Error: {e}")
+            total = sum(1 for _ in csv.DictReader(f))
+
+        count = 0
+        processed = 0
+        batch = []
+        with open(file_path, 'r', encoding='utf-8') as f, self.driver.session(database="neo4j") as session:
+            def flush():
+                nonlocal count
+                count += self._write_rows(session, list(batch))
+                batch.clear()
+
+            for row in csv.DictReader(f):
+                processed += 1
+                try:
+                    batch.append({
+                        "category": row.get('category', 'Uncategorized'), 
+                        "sku": row['sku'],
+                        "name": row['name'],
+                        "price": float(row.get('price', 0)),
+                        "url": row.get('product_url', ''), 
+                        "image_url": row.get('image_url', '')
+                    })
+                except Exception as e:
+                    logger.error(f"Neo4j Row Error: {e}")
+                if len(batch) >= batch_size:
+                    flush()
+                    report_progress(processed, total, unit="products", message="Ingesting products into Neo4j")
+            if batch:
+                flush()
+        logger.info(f"Neo4j: ingested {count} of {processed} rows in batches of {batch_size}.")
         return count
 
 def seed_sql_db(file_path):
@@ -220,20 +375,25 @@ def run_master_ingestion() -> dict:
     stats = {"sql_added": 0, "neo4j_added": 0}
 
     # Step 1: SQL Sync
+    report_progress(message="Seeding SQL products")
     try:
         stats["sql_added"] = seed_sql_db(CSV_PATH)
     except Exception as e:
         return {"error": f"SQL Sync failed: {str(e)}"}
 
     # Step 2: Neo4j Sync
+    # The graph is wiped and reloaded in place: once the wipe starts, cancelling is
+    # refused until the reload has finished, so the graph is never left half loaded.
     ingestor = None
     try:
-        ingestor = Neo4jIngestor(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)
-        ingestor.clear_database()
-        ingestor.setup_constraints()
-        stats["neo4j_added"] = ingestor.ingest_csv(CSV_PATH)
+        with non_cancellable(message="Clearing Neo4j"):
+            ingestor = Neo4jIngestor(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD, driver=get_driver())
+            ingestor.clear_database()
+            ingestor.setup_constraints()
+            stats["neo4j_added"] = ingestor.ingest_csv(CSV_PATH)
         
-        if graph: graph.refresh_schema()
+        schema_refresher.refresh_now()
+        cypher_templates.category_names.invalidate()
         
     except Exception as e:
         return {"error": f"Neo4j Sync failed: {str(e)}", "partial_stats": stats}
@@ -243,16 +403,192 @@ def run_master_ingestion() -> dict:
     logger.info("--- MASTER INGESTION COMPLETE ---")
     return stats
 
+def run_clear_neo4j() -> dict:
+    """Deletes every node and relationship from the graph (SQL products are kept)."""
+    logger.warning("--- CLEARING NEO4J GRAPH ---")
+    report_progress(message="Clearing Neo4j")
+    Neo4jIngestor(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD, driver=get_driver()).clear_database()
+    schema_refresher.refresh_now()
+    logger.info("Neo4j graph cleared.")
+    return {"status": "success", "message": "Neo4j graph cleared."}
+
+# --- NATURAL LANGUAGE -> CYPHER ---
+# Write clauses and procedures a generated query must never contain
+_WRITE_CLAUSES = re.compile(r"\b(CREATE|MERGE|DELETE|DETACH|SET|REMOVE|DROP|FOREACH|LOAD\s+CSV)\b", re.IGNORECASE)
+_PROCEDURE_CALL = re.compile(r"\bCALL\s+([\w.]+)", re.IGNORECASE)
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+
+def extract_cypher(text: str) -> str:
+    """The query inside a ```cypher fenced block, or the whole reply."""
+    match = re.search(r"```(?:cypher)?\s*(.*?)```", text, re.DOTALL | re.IGNORECASE)
+    return (match.group(1) if match else text).strip()
+
+def validate_cypher(cypher: str) -> str:
+    """Accepts read-only queries only; raises ValueError otherwise."""
+    if not cypher:
+        raise ValueError("No Cypher query was generated.")
+    code = _STRING_LITERAL.sub("''", cypher)
+    write = _WRITE_CLAUSES.search(code)
+    if write:
+        raise ValueError(f"Generated Cypher is not read-only ({write.group(1).upper()}).")
+    for procedure in _PROCEDURE_CALL.findall(code):
+        if not procedure.lower().startswith("db.index.fulltext."):
+            raise ValueError(f"Generated Cypher calls a disallowed procedure ({procedure}).")
+    return cypher
+
+def schema_fingerprint() -> str:
+    return hashlib.sha256(graph.get_schema.encode("utf-8")).hexdigest()[:16]
+
+def load_category_names():
+    return [row["name"] for row in graph.query("MATCH (c:Category) RETURN c.name AS name")]
+
+def product_rows(rows) -> list:
+    """Rows as plain dicts keyed by property name ('p.price' -> 'price')."""
+    return [{key.split(".")[-1]: value for key, value in row.items()} for row in rows]
+
+# --- QUERY PIPELINE ---
+# The steps from question to rows (and answer) are written once, as a generator that
+# yields its I/O instead of doing it:
+#   ("categories",)             -> category names for template matching
+#   ("query", cypher, params)   -> up to CYPHER_TOP_K rows
+#   ("generate", prompt_inputs) -> LLM reply for the Cypher generation prompt
+#   ("answer", qa_inputs)       -> LLM reply for the QA prompt
+# run_steps performs them with the sync driver/invoke, arun_steps with the async
+# driver/ainvoke. A failed step is thrown back into the generator at the yield.
+
+def graph_query_steps(question: str, answer: bool = False):
+    """
+    NL question -> Cypher -> rows (-> natural-language answer when `answer`).
+    Common product intents get their Cypher from a template instead of an LLM call;
+    anything else (or a template that found nothing) uses Cypher from the cache, or
+    generated and checked read-only. Generated Cypher that executes and returns rows
+    is cached per question until the graph schema changes.
+    """
+    if not neo4j_available:
+        raise RuntimeError("Graph DB unavailable.")
+    rows, intent = [], None
+    if cypher_templates.CYPHER_TEMPLATES_ENABLED:
+        plan = cypher_templates.plan_query(question, (yield ("categories",)))
+        if plan is not None:
+            intent = plan.intent
+            try:
+                rows = yield ("query", plan.cypher, plan.params)
+            except Exception as e:
+                logger.warning(f"Template Cypher ({plan.intent}) failed: {e}")
+            cypher_templates.record_template(plan.intent, len(rows))
+            logger.info(f"Template Cypher ({plan.intent}, {plan.params}): {len(rows)} rows")
+
+    if not rows:
+        cypher_templates.record_llm_fallback(after_template=intent is not None)
+        cypher_cache.set_version(schema_fingerprint())
+        cache_key = cypher_cache.key(question)
+        cypher = cypher_cache.get(cache_key) if CYPHER_CACHE_ENABLED else None
+        if cypher:
+            logger.info(f"Cypher cache hit: {cypher}")
+            try:
+                rows = yield ("query", cypher, {})
+            except Exception as e:
+                logger.warning(f"Cached Cypher failed ({e}). Regenerating.")
+                cypher_cache.discard(cache_key)
+                cypher = None
+        if not cypher:
+            reply = yield ("generate", {"question": question, "schema": graph.get_schema})
+            cypher = validate_cypher(extract_cypher(reply))
+            logger.info(f"Generated Cypher: {cypher}")
+            rows = yield ("query", cypher, {})
+            if rows and CYPHER_CACHE_ENABLED:
+                cypher_cache.put(cache_key, cypher)
+
+    if answer:
+        return (yield ("answer", {"question": question, "context": rows}))
+    return rows
+
+def _sync_step(step):
+    kind = step[0]
+    if kind == "categories":
+        return cypher_templates.category_names.get(load_category_names)
+    if kind == "query":
+        return graph.query(step[1], step[2])[:CYPHER_TOP_K]
+    if kind == "generate":
+        return cypher_generation_chain.invoke(step[1])
+    return qa_chain.invoke(step[1])
+
+def run_steps(steps):
+    result, error = None, None
+    while True:
+        try:
+            step = steps.throw(error) if error else steps.send(result)
+        except StopIteration as done:
+            return done.value
+        try:
+            result, error = _sync_step(step), None
+        except Exception as e:
+            result, error = None, e
+
+def graph_rows(question: str) -> list:
+    """Rows for a question (see graph_query_steps). Raises on failure."""
+    return run_steps(graph_query_steps(question))
+
 # Helper for QA
 def run_graph_query(question: str) -> str:
+    """Graph rows turned into a natural-language answer by the QA prompt."""
     if not neo4j_available: return "Graph DB unavailable."
     try:
-        return neo4j_qa_chain.invoke({"query": question}).get('result', "No result.")
+        return run_steps(graph_query_steps(question, answer=True))
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+# --- ASYNC QUERY PATH ---
+# The same pipeline with the async driver and ainvoke for the LLM calls (used by
+# /db/graph/query), so concurrent questions on one worker overlap instead of queueing.
+
+async def _read_rows(tx, cypher: str, params: dict):
+    result = await tx.run(cypher, params)
+    return [record.data() for record in await result.fetch(CYPHER_TOP_K)]
+
+async def aquery(cypher: str, params: dict = None) -> list:
+    async with get_async_driver().session(database="neo4j") as session:
+        return await session.execute_read(_read_rows, cypher, params or {})
+
+async def _async_step(step):
+    kind = step[0]
+    if kind == "categories":
+        # Category names are cached; a (rare) reload uses the sync graph, so keep it off the loop
+        return await asyncio.to_thread(cypher_templates.category_names.get, load_category_names)
+    if kind == "query":
+        return await aquery(step[1], step[2])
+    if kind == "generate":
+        return await cypher_generation_chain.ainvoke(step[1])
+    return await qa_chain.ainvoke(step[1])
+
+async def arun_steps(steps):
+    result, error = None, None
+    while True:
+        try:
+            step = steps.throw(error) if error else steps.send(result)
+        except StopIteration as done:
+            return done.value
+        try:
+            result, error = await _async_step(step), None
+        except Exception as e:
+            result, error = None, e
+
+async def agraph_rows(question: str) -> list:
+    """Async graph_rows. Raises on failure."""
+    return await arun_steps(graph_query_steps(question))
+
+async def arun_graph_query(question: str) -> str:
+    """Async run_graph_query."""
+    if not neo4j_available: return "Graph DB unavailable."
+    try:
+        return await arun_steps(graph_query_steps(question, answer=True))
     except Exception as e:
         return f"Error: {str(e)}"
 
 # --- REAL-TIME ADMIN SYNC FUNCTIONS ---
 
+SYNC_PRODUCT_PROPERTIES = ["name", "price", "url", "image_url", "stock_quantity", "sku"]
+
 def sync_single_product(product_data):
     """
     Syncs a single product from PostgreSQL to Neo4j.
@@ -275,10 +611,8 @@ def sync_single_product(product_data):
     MERGE (p)-[:IN_CATEGORY]->(c)
     """
     
-    driver = None
     try:
-        driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
-        with driver.session(database="neo4j") as session:
+        with get_driver().session(database="neo4j") as session:
             # Handle both dictionary or SQLAlchemy object
             params = {
                 "category": getattr(product_data, 'category', 'Uncategorized'),
@@ -291,16 +625,16 @@ def sync_single_product(product_data):
             }
             session.run(sync_query, **params)
             logger.info(f"Neo4j: Successfully synced product {params['sku']}")
+            # The product may have introduced a new category
+            cypher_templates.category_names.invalidate()
             
-            # Refresh LangChain graph schema to ensure the agent sees changes
-            if graph:
-                graph.refresh_schema()
+        # Refresh LangChain graph schema so the agent sees new labels/properties.
+        # Edits that only change property values leave the schema as it is.
+        if not (schema_covers("Product", SYNC_PRODUCT_PROPERTIES, ["IN_CATEGORY"]) and schema_covers("Category", ["name"])):
+            schema_refresher.request()
                 
     except Exception as e:
         logger.error(f"Neo4j Single Sync Error: {e}")
-    finally:
-        if driver:
-            driver.close()
 
 def delete_product_node(sku: str):
     """
@@ -308,16 +642,11 @@ def delete_product_node(sku: str):
     """
     delete_query = "MATCH (p:Product {sku: $sku}) DETACH DELETE p"
     
-    driver = None
     try:
-        driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
-        with driver.session(database="neo4j") as session:
+        with get_driver().session(database="neo4j") as session:
             session.run(delete_query, sku=sku)
             logger.info(f"Neo4j: Deleted product node {sku}")
-            if graph:
-                graph.refresh_schema()
+        # Deleting can only retire schema entries; a coalesced refresh is enough
+        schema_refresher.request()
     except Exception as e:
-        logger.error(f"Neo4j Delete Error: {e}")
-    finally:
-        if driver:
-            driver.close()
\ No newline at end of file
+        logger.error(f"Neo4j Delete Error: {e}")
\ No newline at end of file
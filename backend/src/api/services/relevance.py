@@ -0,0 +1,116 @@
+import os
+import threading
+from collections import deque
+from typing import List
+import numpy as np
+
+from src.utils.metrics import histogram_bucket
+
+# IMPORT LOGGER
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# --- CONFIGURATION ---
+# Relevance = cosine similarity between the question and a chunk's stored vector,
+# whatever retriever (dense, BM25, fused) produced the chunk.
+# Chunks below this score are never returned (0 disables the threshold)
+RETRIEVAL_MIN_SCORE = float(os.getenv("RETRIEVAL_MIN_SCORE", "0.2"))
+# Adaptive k: stop adding chunks once the score falls this far below the previous one
+RETRIEVAL_ADAPTIVE_K = os.getenv("RETRIEVAL_ADAPTIVE_K", "true").lower() == "true"
+RETRIEVAL_SCORE_DROPOFF = float(os.getenv("RETRIEVAL_SCORE_DROPOFF", "0.15"))
+# The drop-off rule never cuts below this many chunks (the minimum score still applies)
+RETRIEVAL_MIN_K = int(os.getenv("RETRIEVAL_MIN_K", "1"))
+
+def relevance_enabled() -> bool:
+    return RETRIEVAL_MIN_SCORE > 0 or RETRIEVAL_ADAPTIVE_K
+
+def cosine_scores(query_vector, vectors: np.ndarray) -> np.ndarray:
+    """Cosine similarity of each row of `vectors` to the query (0 for empty vectors)."""
+    query = np.asarray(query_vector, dtype=np.float32)
+    if len(vectors) == 0:
+        return np.zeros(0, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1) * (np.linalg.norm(query) or 1.0)
+    norms[norms == 0] = np.inf
+    return (vectors @ query) / norms
+
+def above_min_score(scores: np.ndarray, min_score: float = RETRIEVAL_MIN_SCORE) -> List[int]:
+    """Positions of candidates that clear the minimum score, in their original order."""
+    return [i for i, score in enumerate(scores) if score >= min_score]
+
+def adaptive_k(scores: List[float], k: int, dropoff: float = RETRIEVAL_SCORE_DROPOFF,
+               min_k: int = RETRIEVAL_MIN_K) -> int:
+    """
+    How many of the (descending) scores to keep, at most k: the list is cut at the
+    first gap larger than `dropoff`, so one strong match isn't padded with weak ones.
+    """
+    ordered = sorted(scores, reverse=True)[:k]
+    for i in range(max(min_k, 1), len(ordered)):
+        if ordered[i - 1] - ordered[i] > dropoff:
+            return i
+    return len(ordered)
+
+# --- STATISTICS ---
+# In-process counters exposed through /admin/retrieval-relevance/stats.
+_RECENT_WINDOW = 100
+
+_stats_lock = threading.Lock()
+_stats = {
+    "queries": 0,
+    "candidates": 0,
+    "below_min_score": 0,
+    "cut_by_dropoff": 0,
+    "returned": 0,
+    "empty_results": 0,
+    "chosen_k_histogram": {},
+    "score_histogram": {},
+}
+_recent = deque(maxlen=_RECENT_WINDOW)
+
+def record_selection(question: str, k: int, candidates: int, below_min: int, picked: List[float], kept: int):
+    """Records one query: requested k, candidate count, and the scores of the chunks returned."""
+    returned = sorted(picked, reverse=True)[:kept]
+    with _stats_lock:
+        _stats["queries"] += 1
+        _stats["candidates"] += candidates
+        _stats["below_min_score"] += below_min
+        _stats["cut_by_dropoff"] += len(picked) - kept
+        _stats["returned"] += kept
+        _stats["empty_results"] += 1 if kept == 0 else 0
+        _stats["chosen_k_histogram"][kept] = _stats["chosen_k_histogram"].get(kept, 0) + 1
+        for score in returned:
+            bucket = histogram_bucket(score)
+            _stats["score_histogram"][bucket] = _stats["score_histogram"].get(bucket, 0) + 1
+        _recent.append({
+            "question": question[:200],
+            "requested_k": k,
+            "chosen_k": kept,
+            "candidates": candidates,
+            "below_min_score": below_min,
+            "scores": [round(float(score), 4) for score in sorted(picked, reverse=True)],
+        })
+    logger.info(f"Relevance: kept {kept} of {candidates} candidates (k={k}, "
+                f"top score {returned[0] if returned else 0:.3f}).")
+
+def get_relevance_stats() -> dict:
+    """Snapshot of the chosen-k and score distributions plus the most recent queries."""
+    with _stats_lock:
+        snapshot = {key: value for key, value in _stats.items() if not key.endswith("histogram")}
+        chosen_k = dict(sorted(_stats["chosen_k_histogram"].items()))
+        histogram = dict(sorted(_stats["score_histogram"].items()))
+        recent = list(_recent)
+
+    queries = snapshot["queries"]
+    return {
+        **snapshot,
+        "avg_chosen_k": round(snapshot["returned"] / queries, 2) if queries else 0.0,
+        "settings": {
+            "min_score": RETRIEVAL_MIN_SCORE,
+            "adaptive_k": RETRIEVAL_ADAPTIVE_K,
+            "score_dropoff": RETRIEVAL_SCORE_DROPOFF,
+            "min_k": RETRIEVAL_MIN_K,
+        },
+        "chosen_k_histogram": chosen_k,
+        "score_histogram": histogram,
+        "recent": recent[::-1],
+    }
@@ -0,0 +1,115 @@
+import os
+import re
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Callable, Optional
+from langchain_core.documents import Document
+
+from src.api.services.lexical_index import STOPWORDS
+
+# IMPORT LOGGER
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# --- CONFIGURATION ---
+# RERANKER:
+#   none          - keep the retrieval order (default)
+#   lexical       - query-term coverage + phrase overlap, pure Python, ~microseconds per chunk
+#   cross_encoder - small CPU cross-encoder (needs `sentence-transformers`; falls back to lexical)
+RERANKER = os.getenv("RERANKER", "none").strip().lower()
+RERANK_CANDIDATES = int(os.getenv("RERANK_CANDIDATES", "25"))
+RERANK_BATCH_SIZE = int(os.getenv("RERANK_BATCH_SIZE", "16"))
+RERANK_WORKERS = int(os.getenv("RERANK_WORKERS", "2"))
+# Per-request budget; when exceeded the retrieval order is kept
+RERANK_TIMEOUT_SECONDS = float(os.getenv("RERANK_TIMEOUT_SECONDS", "0.5"))
+RERANK_MODEL = os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+
+_executor = ThreadPoolExecutor(max_workers=RERANK_WORKERS, thread_name_prefix="rerank")
+
+def _terms(text: str) -> List[str]:
+    return [t for t in re.findall(r"\w+", text.lower()) if t not in STOPWORDS]
+
+def lexical_scores(query: str, texts: List[str]) -> List[float]:
+    """
+    Share of query terms present in the chunk, plus a bonus for query bigrams
+    appearing verbatim (plan names, product names, phone numbers).
+    """
+    query_terms = _terms(query)
+    if not query_terms:
+        return [0.0] * len(texts)
+    unique_terms = set(query_terms)
+    bigrams = {f"{a} {b}" for a, b in zip(query_terms, query_terms[1:])}
+    scores = []
+    for text in texts:
+        terms = _terms(text)
+        coverage = len(unique_terms & set(terms)) / len(unique_terms)
+        phrase = 0.0
+        if bigrams:
+            text_bigrams = {f"{a} {b}" for a, b in zip(terms, terms[1:])}
+            phrase = len(bigrams & text_bigrams) / len(bigrams)
+        scores.append(coverage + 0.5 * phrase)
+    return scores
+
+_cross_encoder = None
+_cross_encoder_lock = threading.Lock()
+_cross_encoder_failed = False
+
+def _load_cross_encoder():
+    global _cross_encoder, _cross_encoder_failed
+    with _cross_encoder_lock:
+        if _cross_encoder is None and not _cross_encoder_failed:
+            try:
+                from sentence_transformers import CrossEncoder
+                _cross_encoder = CrossEncoder(RERANK_MODEL, device="cpu")
+                logger.info(f"Cross-encoder reranker loaded: {RERANK_MODEL}")
+            except Exception as e:
+                _cross_encoder_failed = True
+                logger.warning(f"Cross-encoder unavailable ({e}). Falling back to lexical reranking.")
+        return _cross_encoder
+
+def cross_encoder_scores(query: str, texts: List[str]) -> List[float]:
+    model = _load_cross_encoder()
+    if model is None:
+        return lexical_scores(query, texts)
+    return [float(s) for s in model.predict([(query, t) for t in texts], batch_size=len(texts))]
+
+RERANKERS = {
+    "lexical": lexical_scores,
+    "cross_encoder": cross_encoder_scores,
+}
+
+def get_scorer(name: str = RERANKER) -> Optional[Callable[[str, List[str]], List[float]]]:
+    return RERANKERS.get(name)
+
+async def rerank(query: str, docs: List[Document], name: str = RERANKER,
+                 timeout: float = RERANK_TIMEOUT_SECONDS) -> List[Document]:
+    """
+    Re-orders retrieved candidates by reranker score. Batches are scored in a
+    dedicated thread pool; if they don't finish within `timeout` the original
+    order is returned so a slow model never holds up the answer.
+    """
+    scorer = get_scorer(name)
+    if scorer is None or len(docs) <= 1:
+        return docs
+
+    loop = asyncio.get_running_loop()
+    texts = [doc.page_content for doc in docs]
+    batches = [texts[i:i + RERANK_BATCH_SIZE] for i in range(0, len(texts), RERANK_BATCH_SIZE)]
+    try:
+        results = await asyncio.wait_for(
+            asyncio.gather(*[loop.run_in_executor(_executor, scorer, query, batch) for batch in batches]),
+            timeout=timeout
+        )
+    except asyncio.TimeoutError:
+        logger.warning(f"Reranking {len(docs)} candidates exceeded {timeout}s. Keeping retrieval order.")
+        return docs
+    except Exception as e:
+        logger.error(f"Reranking failed, keeping retrieval order: {e}")
+        return docs
+
+    scores = [score for batch in results for score in batch]
+    # Stable sort: equal scores keep their retrieval order
+    order = sorted(range(len(docs)), key=lambda i: -scores[i])
+    return [docs[i] for i in order]
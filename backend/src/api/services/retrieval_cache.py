@@ -0,0 +1,104 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Tuple
+
+# IMPORT LOGGER
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# --- CONFIGURATION ---
+RETRIEVAL_CACHE_ENABLED = os.getenv("RETRIEVAL_CACHE_ENABLED", "true").lower() == "true"
+RETRIEVAL_CACHE_SIZE = int(os.getenv("RETRIEVAL_CACHE_SIZE", "512"))
+
+def normalize_question(question: str) -> str:
+    """'  What  is PEO TV? ' and 'what is peo tv' share a cache entry."""
+    return re.sub(r"\s+", " ", question).strip().lower().rstrip("?!. ")
+
+def freeze(value: Any) -> Any:
+    """Makes filter dicts/lists hashable so they can be part of a cache key."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+class RetrievalCache:
+    """
+    In-process LRU keyed by question. Every key ends with the cache's current
+    version, an opaque value owned by the caller: the collection generation,
+    which ingestion and clearing bump, or the graph schema fingerprint. Changing
+    the version drops every entry, so results built from an older state can
+    never be served again.
+    """
+
+    def __init__(self, max_size: int = RETRIEVAL_CACHE_SIZE, version: Hashable = 0,
+                 enabled: bool = RETRIEVAL_CACHE_ENABLED, name: str = "Retrieval"):
+        self.max_size = max_size
+        self.version = version
+        self.enabled = enabled
+        self.name = name
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0, "failures": 0}
+
+    def key(self, question: str, *parts: Any) -> Tuple:
+        return (normalize_question(question), *(freeze(p) for p in parts), self.version)
+
+    def get(self, key: Tuple) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._entries[key]
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: Tuple, value: Any):
+        with self._lock:
+            # A result computed while the version changed belongs to an older state
+            if key[-1] != self.version:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def discard(self, key: Tuple):
+        """Drops an entry that turned out to be unusable (e.g. Cypher that failed to run)."""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._stats["failures"] += 1
+
+    def set_version(self, version: Hashable):
+        with self._lock:
+            if version == self.version:
+                return
+            if self._entries:
+                self._stats["invalidations"] += len(self._entries)
+                self._entries.clear()
+            self.version = version
+            logger.info(f"{self.name} cache invalidated (version {version}).")
+
+    def bump_generation(self) -> int:
+        with self._lock:
+            version = self.version + 1
+        self.set_version(version)
+        return version
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "enabled": self.enabled,
+                "version": self.version,
+                "entries": len(self._entries),
+                "max_size": self.max_size,
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+retrieval_cache = RetrievalCache()
@@ -1,6 +1,10 @@
 import os
+import time
+import threading
+from collections import deque
 import chromadb
-from langchain_openai import OpenAIEmbeddings
+from src.api.services.embedding_providers import get_embeddings, check_collection_embeddings
+from src.utils.metrics import histogram_bucket
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -16,44 +20,144 @@ os.makedirs(CHROMA_PERSIST_DIR, exist_ok=True)
 # Initialize ONE unified PersistentClient pointing to the shared folder
 chroma_client = chromadb.PersistentClient(path=CHROMA_PERSIST_DIR)
 
-embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+CACHE_COLLECTION_NAME = "semantic_response_cache"
 
-# Use cosine similarity. This collection sits safely next to 'enterprise_data'
-cache_collection = chroma_client.get_or_create_collection(
-    name="semantic_response_cache",
-    metadata={"hnsw:space": "cosine"} 
-)
+embeddings = get_embeddings(CACHE_COLLECTION_NAME)
 
-def check_semantic_cache(question: str, threshold: float = 0.85) -> str | None:
+# Minimum cosine similarity for a cached answer to be served.
+# Tune with src/scripts/calibrate_semantic_cache.py before changing it.
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.85"))
+
+def _create_cache_collection():
+    # Use cosine similarity. This collection sits safely next to 'enterprise_data'
+    collection = chroma_client.get_or_create_collection(
+        name=CACHE_COLLECTION_NAME,
+        metadata={"hnsw:space": "cosine"} 
+    )
+    check_collection_embeddings(collection, embeddings)
+    return collection
+
+try:
+    cache_collection = _create_cache_collection()
+except ValueError as e:
+    # Cached answers are disposable, so rebuild instead of mixing vector spaces
+    logger.warning(f"{e} Recreating the semantic cache.")
+    chroma_client.delete_collection(name=CACHE_COLLECTION_NAME)
+    cache_collection = _create_cache_collection()
+
+# --- CACHE STATISTICS ---
+# In-process counters exposed through /admin/semantic-cache/stats.
+_LATENCY_WINDOW = 1000
+
+_stats_lock = threading.Lock()
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "errors": 0,
+    "evictions": 0,
+    "score_histogram": {},
+}
+_lookup_latencies_ms = deque(maxlen=_LATENCY_WINDOW)
+
+def _record_lookup(outcome: str, latency_ms: float, score: float | None = None):
+    with _stats_lock:
+        _stats[outcome] += 1
+        _lookup_latencies_ms.append(latency_ms)
+        if score is not None:
+            bucket = histogram_bucket(score)
+            _stats["score_histogram"][bucket] = _stats["score_histogram"].get(bucket, 0) + 1
+
+def _percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def count_semantic_cache_entries() -> int | None:
+    """Number of cached question/answer pairs, or None if the collection can't be read."""
+    try:
+        return cache_collection.count()
+    except Exception as e:
+        logger.error(f"Error counting semantic cache entries: {e}")
+        return None
+
+def get_semantic_cache_stats() -> dict:
+    """Returns a snapshot of hit/miss counters, score histogram, size and lookup latency."""
+    with _stats_lock:
+        snapshot = {key: value for key, value in _stats.items() if key != "score_histogram"}
+        histogram = dict(sorted(_stats["score_histogram"].items()))
+        latencies = sorted(_lookup_latencies_ms)
+
+    lookups = snapshot["hits"] + snapshot["misses"]
+    entry_count = count_semantic_cache_entries()
+
+    return {
+        **snapshot,
+        "lookups": lookups,
+        "hit_rate": round(snapshot["hits"] / lookups, 4) if lookups else 0.0,
+        "threshold": SEMANTIC_CACHE_THRESHOLD,
+        "entry_count": entry_count,
+        "score_histogram": histogram,
+        "lookup_latency_ms": {
+            "samples": len(latencies),
+            "avg": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "p50": round(_percentile(latencies, 50), 2),
+            "p95": round(_percentile(latencies, 95), 2),
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+        },
+    }
+
+def lookup_semantic_cache(question: str, collection=None) -> tuple[float | None, str | None]:
+    """
+    Returns (similarity_score, cached_response) of the nearest cached question,
+    or (None, None) if the cache is empty. Applies no threshold.
+    Pass `collection` to search a different Chroma collection (used by calibration).
+    """
+    collection = collection or cache_collection
+    query_embedding = embeddings.embed_query(question)
+
+    results = collection.query(
+        query_embeddings=[query_embedding],
+        n_results=1,
+        include=["metadatas", "distances"]
+    )
+
+    if not results or not results["distances"] or len(results["distances"][0]) == 0:
+        return None, None
+
+    distance = results["distances"][0][0]
+    return 1 - distance, results['metadatas'][0][0].get("response")
+
+def check_semantic_cache(question: str, threshold: float | None = None) -> str | None:
     """
     Search for the question in ChromaDB.
     Returns the answer ONLY if (1 - distance) >= threshold.
     """
+    if threshold is None:
+        threshold = SEMANTIC_CACHE_THRESHOLD
+
+    start = time.perf_counter()
     try:
-        query_embedding = embeddings.embed_query(question)
-        
-        results = cache_collection.query(
-            query_embeddings=[query_embedding],
-            n_results=1,
-            include=["metadatas", "distances"]
-        )
+        similarity_score, response = lookup_semantic_cache(question)
+        latency_ms = (time.perf_counter() - start) * 1000
 
-        if not results or not results["distances"] or len(results["distances"][0]) == 0:
+        if similarity_score is None:
+            _record_lookup("misses", latency_ms)
             return None
 
-        distance = results["distances"][0][0]
-        similarity_score = 1 - distance 
-
         logger.info(f"🔍 Cache Search: Score {similarity_score:.4f} | Threshold {threshold}")
 
         if similarity_score >= threshold:
+            _record_lookup("hits", latency_ms, similarity_score)
             logger.info("🟢 Semantic Cache HIT!")
-            return results['metadatas'][0][0].get("response")
+            return response
         
+        _record_lookup("misses", latency_ms, similarity_score)
         logger.info("🔴 Semantic Cache MISS: Score below threshold.")
         return None
 
     except Exception as e:
+        _record_lookup("errors", (time.perf_counter() - start) * 1000)
         logger.error(f"Error checking semantic cache: {e}")
         return None
     
@@ -77,16 +181,20 @@ def clear_semantic_cache():
     """Wipes ONLY the semantic cache collection to prevent stale data."""
     global cache_collection
     try:
+        try:
+            dropped = cache_collection.count()
+        except Exception:
+            dropped = 0
+
         # Safely delete ONLY the cache collection, keeping enterprise_data intact
-        chroma_client.delete_collection(name="semantic_response_cache")
+        chroma_client.delete_collection(name=CACHE_COLLECTION_NAME)
         
         # Recreate a fresh, empty collection
-        cache_collection = chroma_client.get_or_create_collection(
-            name="semantic_response_cache",
-            metadata={"hnsw:space": "cosine"} 
-        )
-        logger.info("🗑️ Semantic Cache cleared (Collection cleanly recreated).")
+        cache_collection = _create_cache_collection()
+        with _stats_lock:
+            _stats["evictions"] += dropped
+        logger.info(f"🗑️ Semantic Cache cleared (Collection cleanly recreated, {dropped} entries evicted).")
         return True
     except Exception as e:
         logger.error(f"Error clearing semantic cache: {e}")
-        return False
\ No newline at end of file
+        return False
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Dict
@@ -21,13 +22,27 @@ logger.info("Database tables created (if they didn't exist).")
 
 # Importing Routers
 from .api.routers import v1_chat, db_utils, core, neo4j_utils, admin, email, neo4j_products, auth, orders, products
+from .api.services import neo4j_service
 
 logger.info("FastAPI application initialized and routers included.")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One Neo4j connection pool for the lifetime of the app
+    if neo4j_service.NEO4J_URI:
+        try:
+            neo4j_service.get_driver().verify_connectivity()
+        except Exception as e:
+            logger.warning(f"Neo4j driver could not connect at startup: {e}")
+    yield
+    await neo4j_service.close_async_driver()
+    neo4j_service.close_driver()
+
 # FastAPI Setup and CORS
 api = FastAPI(
     title="AI Enterprise Agent API (v1)",
-    description="API for interacting with the LangGraph agent."
+    description="API for interacting with the LangGraph agent.",
+    lifespan=lifespan
 )
 
 env_origins = os.getenv("ALLOWED_ORIGINS")
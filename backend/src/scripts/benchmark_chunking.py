@@ -0,0 +1,131 @@
+"""
+Compares chunking strategies on the scraped data files (data/<source>_data.json[l]).
+
+For each chunker the data is split, embedded into a scratch Chroma collection and
+measured: chunk count, chunk size in tokens, index size on disk, build time and
+(optionally) dense retrieval quality on a labelled question set:
+recall@k is the share of expected snippets found in the top-k chunks,
+hit@k the share of questions where at least one snippet was found.
+
+Labels file: same format as benchmark_retrieval.py
+    [{"question": "Customer hotline number?", "expected": ["1212"]}]
+
+Usage (from the backend folder):
+    python src/scripts/benchmark_chunking.py --labels data/retrieval_benchmark.json --k 5
+
+Embedding every chunk calls the configured embedding backend once per chunker;
+set EMBEDDING_BACKEND=hashing for a free (structure-only) comparison.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+import chromadb
+
+from src.api.services import db_service
+from src.api.services.chunking import split_documents, token_count
+from src.api.services.ingestion_pipeline import iter_json_items, write_chunks
+
+CHUNKERS = ["character", "structured"]
+SOURCES = ["website", "linkedin", "facebook", "tiktok"]
+
+def load_documents():
+    docs = []
+    for source in SOURCES:
+        file_path = db_service.find_data_file(source)
+        if not file_path:
+            continue
+        for i, entry in enumerate(iter_json_items(file_path)):
+            doc = db_service.build_document(entry, source, i)
+            if doc is not None:
+                docs.append(doc)
+    return docs
+
+def load_labels(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        items = json.load(f)
+    return [item for item in items if item.get("question") and item.get("expected")]
+
+def directory_size_mb(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return total / (1024 * 1024)
+
+def evaluate(collection, labels, k):
+    found, hits = 0, 0
+    total = sum(len(item["expected"]) for item in labels)
+    query_vectors = db_service.embeddings.embed_documents([item["question"] for item in labels])
+    for item, vector in zip(labels, query_vectors):
+        result = collection.query(query_embeddings=[vector], n_results=k, include=["documents"])
+        text = "\n".join(result["documents"][0]).lower()
+        matched = sum(1 for snippet in item["expected"] if snippet.lower() in text)
+        found += matched
+        hits += 1 if matched else 0
+    return found / total, hits / len(labels)
+
+def run_chunker(chunker, docs, labels, k):
+    start = time.perf_counter()
+    chunks = split_documents(docs, chunker=chunker)
+    split_seconds = time.perf_counter() - start
+    sizes = sorted(token_count(chunk.page_content) for chunk in chunks)
+
+    row = {
+        "chunks": len(chunks),
+        "avg_tokens": sum(sizes) / max(len(sizes), 1),
+        "max_tokens": sizes[-1] if sizes else 0,
+        "split_s": split_seconds,
+    }
+    scratch_dir = tempfile.mkdtemp(prefix=f"chunking_{chunker}_")
+    try:
+        client = chromadb.PersistentClient(path=scratch_dir)
+        collection = client.get_or_create_collection(name=f"benchmark_{chunker}")
+        ids = [db_service.chunk_id(c.metadata["source"], f"{c.metadata['item_key']}|{n}", c.page_content)
+               for n, c in enumerate(chunks)]
+        start = time.perf_counter()
+        write_chunks(collection, db_service.embeddings, ids, chunks)
+        row["embed_s"] = time.perf_counter() - start
+        row["disk_mb"] = directory_size_mb(scratch_dir)
+        if labels:
+            row["recall"], row["hit"] = evaluate(collection, labels, k)
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+    return row
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the character splitter vs the structured token chunker.")
+    parser.add_argument("--labels", help="JSON list of {question, expected: [snippets]}")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--data-dir", help="Folder with the scraped data files (default: backend/data)")
+    parser.add_argument("--chunkers", nargs="+", default=CHUNKERS, choices=CHUNKERS)
+    args = parser.parse_args()
+
+    if args.data_dir:
+        db_service.DATA_DIR = args.data_dir
+    docs = load_documents()
+    if not docs:
+        print("No documents found in the data files.")
+        return
+    labels = load_labels(args.labels) if args.labels else []
+    print(f"--- Benchmarking {len(docs)} documents, {len(labels)} labelled questions, k={args.k} ---")
+
+    header = f"{'chunker':>10} {'chunks':>7} {'avg_tok':>8} {'max_tok':>8} {'split_s':>8} {'embed_s':>8} {'disk_mb':>8}"
+    if labels:
+        header += f" {'recall@' + str(args.k):>9} {'hit@' + str(args.k):>7}"
+    print(header)
+    for chunker in args.chunkers:
+        row = run_chunker(chunker, docs, labels, args.k)
+        line = (f"{chunker:>10} {row['chunks']:>7} {row['avg_tokens']:>8.1f} {row['max_tokens']:>8} "
+                f"{row['split_s']:>8.2f} {row['embed_s']:>8.2f} {row['disk_mb']:>8.2f}")
+        if labels:
+            line += f" {row['recall']:>9.3f} {row['hit']:>7.3f}"
+        print(line)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Measures Neo4j product ingestion throughput for different UNWIND batch sizes.
+
+Each run wipes the graph, recreates the constraints and loads the CSV with
+Neo4jIngestor.ingest_csv; batch size 1 is equivalent to the old one
+transaction per row. The graph is left loaded by the last run.
+
+WARNING: deletes every node in the configured Neo4j database (NEO4J_URI).
+
+Usage (from the backend folder):
+    python src/scripts/benchmark_neo4j_ingest.py --yes
+    python src/scripts/benchmark_neo4j_ingest.py --csv data/products.csv --batch-sizes 1 100 500 2000 --yes
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from src.api.services.neo4j_service import (
+    Neo4jIngestor, CSV_PATH, NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD
+)
+
+def run(ingestor, csv_path, batch_size):
+    ingestor.clear_database()
+    ingestor.setup_constraints()
+    start = time.perf_counter()
+    rows = ingestor.ingest_csv(csv_path, batch_size=batch_size)
+    seconds = time.perf_counter() - start
+    return rows, seconds
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched Neo4j CSV ingestion.")
+    parser.add_argument("--csv", default=CSV_PATH, help="Products CSV (default: data/products.csv)")
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 100, 500, 1000])
+    parser.add_argument("--yes", action="store_true", help="Confirm that the graph may be wiped")
+    args = parser.parse_args()
+
+    if not args.yes:
+        print(f"This wipes every node in {NEO4J_URI}. Re-run with --yes to continue.")
+        return
+    if not os.path.exists(args.csv):
+        print(f"CSV not found at {args.csv}")
+        return
+
+    ingestor = Neo4jIngestor(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)
+    try:
+        print(f"--- Benchmarking ingestion of {args.csv} into {NEO4J_URI} ---")
+        print(f"{'batch':>6} {'rows':>7} {'seconds':>8} {'rows/s':>9}")
+        for batch_size in args.batch_sizes:
+            rows, seconds = run(ingestor, args.csv, batch_size)
+            print(f"{batch_size:>6} {rows:>7} {seconds:>8.2f} {rows / seconds if seconds else 0:>9.1f}")
+    finally:
+        ingestor.close()
+
+if __name__ == "__main__":
+    main()
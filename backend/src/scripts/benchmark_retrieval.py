@@ -0,0 +1,78 @@
+"""
+Compares retrieval modes (dense, lexical, hybrid) on the live enterprise_data collection.
+
+Each labelled question lists text snippets that a correct answer must retrieve.
+recall@k is the share of expected snippets found in the top-k chunks;
+hit@k is the share of questions where at least one snippet was found.
+
+Labels file (JSON list):
+    [
+      {"question": "What is the price of the Fibre Unlimited 100 package?", "expected": ["Fibre Unlimited 100"]},
+      {"question": "Customer hotline number?", "expected": ["1212"]}
+    ]
+
+Usage (from the backend folder, after ingesting):
+    python src/scripts/benchmark_retrieval.py data/retrieval_benchmark.json --k 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from src.api.services.db_service import search_documents, SEARCH_MODES
+
+def load_labels(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        items = json.load(f)
+    return [item for item in items if item.get("question") and item.get("expected")]
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+async def run_mode(labels, mode, k):
+    latencies, found, hits = [], 0, 0
+    total = sum(len(item["expected"]) for item in labels)
+    for item in labels:
+        start = time.perf_counter()
+        docs = await search_documents(item["question"], k=k, mode=mode)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        text = "\n".join(doc.page_content for doc in docs).lower()
+        matched = sum(1 for snippet in item["expected"] if snippet.lower() in text)
+        found += matched
+        hits += 1 if matched else 0
+    return {
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "recall": found / total,
+        "hit": hits / len(labels),
+    }
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark dense vs lexical vs hybrid retrieval.")
+    parser.add_argument("labels", help="JSON list of {question, expected: [snippets]}")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", default=list(SEARCH_MODES), choices=SEARCH_MODES)
+    args = parser.parse_args()
+
+    labels = load_labels(args.labels)
+    if not labels:
+        print("No labelled questions found.")
+        return
+    print(f"--- Benchmarking {len(labels)} questions, k={args.k} ---")
+
+    # Warm up the embedding client and index caches so the first mode isn't penalised
+    await search_documents(labels[0]["question"], k=args.k, mode="hybrid")
+
+    print(f"{'mode':>8} {'p50_ms':>8} {'p95_ms':>8} {'recall@' + str(args.k):>9} {'hit@' + str(args.k):>7}")
+    for mode in args.modes:
+        row = await run_mode(labels, mode, args.k)
+        print(f"{mode:>8} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['recall']:>9.3f} {row['hit']:>7.3f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
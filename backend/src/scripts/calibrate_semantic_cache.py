@@ -0,0 +1,113 @@
+"""
+Offline calibration for the semantic cache threshold.
+
+Replays a labelled set of question pairs through the same lookup used by
+check_semantic_cache and reports precision, recall and expected hit rate
+for a range of thresholds.
+
+Pairs file (JSON list):
+    [
+      {"cached": "Show me routers", "query": "Do you sell routers?", "equivalent": true},
+      {"cached": "Show me routers", "query": "Show me smart watches", "equivalent": false}
+    ]
+
+Usage (from the backend folder):
+    python src/scripts/calibrate_semantic_cache.py data/cache_pairs.json --min-precision 0.98
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.append(os.getcwd())
+
+import chromadb
+
+from src.api.services.semantic_cache import embeddings, lookup_semantic_cache, SEMANTIC_CACHE_THRESHOLD
+
+def load_pairs(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        pairs = json.load(f)
+    return [p for p in pairs if p.get("cached") and p.get("query")]
+
+def build_scratch_cache(pairs):
+    """Loads every distinct cached question into a throwaway in-memory collection."""
+    client = chromadb.EphemeralClient()
+    collection = client.get_or_create_collection(
+        name="semantic_cache_calibration",
+        metadata={"hnsw:space": "cosine"}
+    )
+    cached_questions = sorted({p["cached"] for p in pairs})
+    vectors = embeddings.embed_documents(cached_questions)
+    collection.upsert(
+        ids=[f"cal_{i}" for i in range(len(cached_questions))],
+        embeddings=vectors,
+        documents=cached_questions,
+        # Store the question itself as the "response" so we know what was matched
+        metadatas=[{"response": q} for q in cached_questions]
+    )
+    return collection
+
+def replay(pairs, collection):
+    """Returns one (score, is_safe_hit_candidate, equivalent) tuple per pair."""
+    observations = []
+    for pair in pairs:
+        score, matched = lookup_semantic_cache(pair["query"], collection=collection)
+        equivalent = bool(pair.get("equivalent"))
+        # A hit is only safe if the nearest cached question is the labelled equivalent
+        safe = equivalent and matched == pair["cached"]
+        observations.append((score if score is not None else 0.0, safe, equivalent))
+    return observations
+
+def evaluate(observations, threshold):
+    hits = [o for o in observations if o[0] >= threshold]
+    safe_hits = sum(1 for o in hits if o[1])
+    positives = sum(1 for o in observations if o[2])
+    return {
+        "threshold": round(threshold, 3),
+        "hits": len(hits),
+        "precision": safe_hits / len(hits) if hits else 1.0,
+        "recall": safe_hits / positives if positives else 0.0,
+        "hit_rate": len(hits) / len(observations) if observations else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate the semantic cache similarity threshold.")
+    parser.add_argument("pairs_file", help="JSON file with labelled question pairs")
+    parser.add_argument("--start", type=float, default=0.70)
+    parser.add_argument("--stop", type=float, default=0.99)
+    parser.add_argument("--step", type=float, default=0.01)
+    parser.add_argument("--min-precision", type=float, default=0.98,
+                        help="Lowest precision considered safe when recommending a threshold")
+    args = parser.parse_args()
+
+    pairs = load_pairs(args.pairs_file)
+    if not pairs:
+        print(f"Error: No usable pairs in {args.pairs_file}")
+        return
+
+    print(f"--- Replaying {len(pairs)} labelled pairs ---")
+    collection = build_scratch_cache(pairs)
+    observations = replay(pairs, collection)
+
+    print(f"{'threshold':>9} {'hits':>6} {'precision':>9} {'recall':>7} {'hit_rate':>8}")
+    results = []
+    steps = int(round((args.stop - args.start) / args.step))
+    for i in range(steps + 1):
+        threshold = round(args.start + i * args.step, 3)
+        row = evaluate(observations, threshold)
+        results.append(row)
+        marker = "  <- current" if abs(row["threshold"] - SEMANTIC_CACHE_THRESHOLD) < 1e-9 else ""
+        print(f"{row['threshold']:>9.2f} {row['hits']:>6} {row['precision']:>9.3f} {row['recall']:>7.3f} {row['hit_rate']:>8.3f}{marker}")
+
+    safe = [r for r in results if r["precision"] >= args.min_precision and r["hits"]]
+    print("--------------------------------")
+    if safe:
+        best = max(safe, key=lambda r: (r["hit_rate"], r["threshold"]))
+        print(f"✅ Recommended SEMANTIC_CACHE_THRESHOLD={best['threshold']:.2f} "
+              f"(precision {best['precision']:.3f}, expected hit rate {best['hit_rate']:.3f})")
+    else:
+        print(f"❌ No threshold reaches precision >= {args.min_precision}. Keep the current value.")
+
+if __name__ == "__main__":
+    main()
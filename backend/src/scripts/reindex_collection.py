@@ -0,0 +1,217 @@
+"""
+Rebuilds a Chroma collection at a new embedding dimension.
+
+OpenAI text-embedding-3 vectors are truncated and re-normalized in place
+(no API calls). Any other backend change re-embeds the stored documents.
+
+Optionally benchmarks the rebuilt index against the current one:
+index size on disk, vector memory, query latency and recall@k.
+
+Usage (from the backend folder, with the API stopped):
+    python src/scripts/reindex_collection.py --collection enterprise_data --dimensions 512 \\
+        --benchmark data/benchmark_queries.json
+
+    # Benchmark only, keep the live collection untouched
+    python src/scripts/reindex_collection.py --collection enterprise_data --dimensions 256 \\
+        --benchmark data/benchmark_queries.json --dry-run
+
+Afterwards set ENTERPRISE_DATA_EMBEDDING_DIMENSIONS (or EMBEDDING_DIMENSIONS) to the
+same value and restart the API, otherwise the collection signature check will refuse it.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import chromadb
+
+from src.api.services.embedding_providers import (
+    get_embeddings, embedding_metadata, native_dimension, truncate_embeddings, METADATA_KEYS, LEGACY_SIGNATURE
+)
+from src.api.services.collection_versions import read_active_name
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.join(script_dir, '..', '..')
+CHROMA_PERSIST_DIR = os.path.join(project_root, 'chroma_data')
+
+PAGE_SIZE = 500
+
+def read_collection(collection):
+    """Reads every id, document, metadata and embedding from a collection."""
+    ids, documents, metadatas, vectors = [], [], [], []
+    total = collection.count()
+    for offset in range(0, total, PAGE_SIZE):
+        page = collection.get(
+            limit=PAGE_SIZE,
+            offset=offset,
+            include=["documents", "metadatas", "embeddings"]
+        )
+        ids.extend(page["ids"])
+        documents.extend(page["documents"])
+        metadatas.extend(page["metadatas"])
+        vectors.extend(page["embeddings"])
+    return ids, documents, metadatas, np.asarray(vectors, dtype=np.float32)
+
+def collection_signature(collection):
+    metadata = collection.metadata or {}
+    signature = {key: metadata.get(key) for key in METADATA_KEYS}
+    return LEGACY_SIGNATURE if all(v is None for v in signature.values()) else signature
+
+def build_vectors(source_signature, target_embeddings, documents, vectors):
+    target = embedding_metadata(target_embeddings)
+    same_model = (source_signature["embedding_backend"] == target["embedding_backend"] == "openai"
+                  and source_signature["embedding_model"] == target["embedding_model"]
+                  and str(target["embedding_model"]).startswith("text-embedding-3"))
+
+    if same_model and target["embedding_dimension"] <= int(source_signature["embedding_dimension"]):
+        print(f"Truncating {len(documents)} vectors to {target['embedding_dimension']} dims (no API calls)...")
+        return truncate_embeddings(vectors, target["embedding_dimension"])
+
+    print(f"Re-embedding {len(documents)} documents with {target}...")
+    new_vectors = []
+    for i in range(0, len(documents), PAGE_SIZE):
+        new_vectors.extend(target_embeddings.embed_documents(documents[i:i + PAGE_SIZE]))
+    return np.asarray(new_vectors, dtype=np.float32)
+
+def write_collection(client, name, metadata, ids, documents, metadatas, vectors):
+    collection = client.get_or_create_collection(name=name, metadata=metadata)
+    for i in range(0, len(ids), PAGE_SIZE):
+        collection.upsert(
+            ids=ids[i:i + PAGE_SIZE],
+            documents=documents[i:i + PAGE_SIZE],
+            metadatas=metadatas[i:i + PAGE_SIZE],
+            embeddings=vectors[i:i + PAGE_SIZE].tolist()
+        )
+    return collection
+
+def directory_size_mb(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return total / (1024 * 1024)
+
+def load_queries(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        items = json.load(f)
+    return [item["question"] if isinstance(item, dict) else str(item) for item in items]
+
+def time_queries(collection, query_vectors, k):
+    latencies, results = [], []
+    for vector in query_vectors:
+        start = time.perf_counter()
+        hits = collection.query(query_embeddings=[vector], n_results=k, include=[])
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append(hits["ids"][0])
+    latencies.sort()
+    return results, {
+        "avg_ms": sum(latencies) / len(latencies),
+        "p95_ms": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+    }
+
+def benchmark(name, metadata, data, source_embeddings, target_embeddings, source_signature, new_vectors, queries, k):
+    """Builds both indexes in scratch directories so their on-disk size can be compared."""
+    ids, documents, metadatas, vectors = data
+    variants = {
+        "baseline": (vectors, source_embeddings.embed_documents(queries)),
+        "reindexed": (new_vectors, build_vectors(source_signature, target_embeddings, queries,
+                                                 np.asarray(source_embeddings.embed_documents(queries)))),
+    }
+
+    report = {}
+    baseline_ids = None
+    for label, (index_vectors, query_vectors) in variants.items():
+        scratch_dir = tempfile.mkdtemp(prefix=f"reindex_{label}_")
+        try:
+            client = chromadb.PersistentClient(path=scratch_dir)
+            collection = write_collection(client, name, metadata, ids, documents, metadatas, np.asarray(index_vectors))
+            result_ids, latency = time_queries(collection, np.asarray(query_vectors).tolist(), k)
+            if baseline_ids is None:
+                baseline_ids = result_ids
+            recall = np.mean([len(set(a) & set(b)) / max(len(b), 1) for a, b in zip(result_ids, baseline_ids)])
+            report[label] = {
+                "dimensions": int(np.asarray(index_vectors).shape[1]),
+                "disk_mb": directory_size_mb(scratch_dir),
+                # Raw float32 vectors held by the HNSW index
+                "vector_memory_mb": np.asarray(index_vectors).size * 4 / (1024 * 1024),
+                **latency,
+                f"recall@{k}": float(recall),
+            }
+        finally:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    print("--------------------------------")
+    print(f"{'variant':>10} {'dims':>5} {'disk_mb':>8} {'vec_mem_mb':>10} {'avg_ms':>7} {'p95_ms':>7} {'recall@' + str(k):>9}")
+    for label, row in report.items():
+        print(f"{label:>10} {row['dimensions']:>5} {row['disk_mb']:>8.2f} {row['vector_memory_mb']:>10.2f} "
+              f"{row['avg_ms']:>7.2f} {row['p95_ms']:>7.2f} {row[f'recall@{k}']:>9.3f}")
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild a Chroma collection at a new embedding dimension.")
+    parser.add_argument("--collection", default="enterprise_data")
+    parser.add_argument("--dimensions", type=int, required=True)
+    parser.add_argument("--backend", default=None, help="Target backend (defaults to the configured one)")
+    parser.add_argument("--benchmark", default=None, help="JSON list of benchmark questions")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--dry-run", action="store_true", help="Benchmark only, do not replace the collection")
+    args = parser.parse_args()
+
+    client = chromadb.PersistentClient(path=CHROMA_PERSIST_DIR)
+    # The logical name may be served from a versioned collection (e.g. enterprise_data_v3)
+    physical_name = read_active_name(CHROMA_PERSIST_DIR, args.collection)
+    source = client.get_collection(physical_name)
+    source_signature = collection_signature(source)
+    target_embeddings = get_embeddings(args.collection, backend=args.backend, dimensions=args.dimensions)
+    target_signature = embedding_metadata(target_embeddings)
+
+    print(f"--- Re-indexing '{args.collection}' / '{physical_name}' ({source.count()} items) ---")
+    print(f"From: {source_signature}")
+    print(f"To:   {target_signature}")
+
+    data = read_collection(source)
+    ids, documents, metadatas, vectors = data
+    if not ids:
+        print("Collection is empty. Nothing to re-index.")
+        return
+    new_vectors = build_vectors(source_signature, target_embeddings, documents, vectors)
+
+    # Keep the distance function, replace the embedding signature
+    space = ((source.configuration or {}).get("hnsw") or {}).get("space") or (source.metadata or {}).get("hnsw:space")
+    new_metadata = {**({"hnsw:space": space} if space else {}), **target_signature}
+
+    if args.benchmark:
+        # Only text-embedding-3 style models accept a reduced size; at the native size ask for none
+        source_dimension = int(source_signature["embedding_dimension"])
+        native = native_dimension(source_signature["embedding_backend"], source_signature["embedding_model"])
+        source_embeddings = get_embeddings(
+            args.collection,
+            backend=source_signature["embedding_backend"],
+            dimensions=source_dimension if source_dimension != native else None
+        )
+        benchmark(args.collection, new_metadata, data, source_embeddings, target_embeddings,
+                  source_signature, new_vectors, load_queries(args.benchmark), args.k)
+
+    if args.dry_run:
+        print("Dry run: live collection left untouched.")
+        return
+
+    staging_name = f"{physical_name}__reindex"
+    try:
+        client.delete_collection(staging_name)
+    except Exception:
+        pass
+    write_collection(client, staging_name, new_metadata, ids, documents, metadatas, new_vectors)
+
+    client.delete_collection(physical_name)
+    client.get_collection(staging_name).modify(name=physical_name)
+    print(f"✅ '{args.collection}' rebuilt at {target_signature['embedding_dimension']} dimensions.")
+    print(f"Set {args.collection.upper()}_EMBEDDING_DIMENSIONS={args.dimensions} and restart the API.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+# Helpers shared by the in-process stats endpoints (semantic cache, retrieval relevance)
+
+# Similarity score histograms use fixed-width buckets over [0, 1]
+HISTOGRAM_BUCKET_WIDTH = 0.05
+
+def histogram_bucket(score: float, width: float = HISTOGRAM_BUCKET_WIDTH) -> str:
+    """Maps a similarity score to the lower edge of its histogram bucket (e.g. '0.85')."""
+    bucket = int(max(score, 0.0) / width) * width
+    return f"{min(bucket, 1.0):.2f}"
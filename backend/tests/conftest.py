@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Run from the backend folder: service modules import as `src.api...`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Offline defaults so service modules import without credentials
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("EMBEDDING_BACKEND", "hashing")
@@ -0,0 +1,54 @@
+from langchain_core.documents import Document
+
+from src.api.services import chunking
+from src.api.services.chunking import split_document, split_sections, split_structured, token_count, truncate_to_tokens
+
+
+def test_heading_opens_a_section_only_before_body_text():
+    text = "Home\nShop\nAbout\n\nFibre Plans\nOur fibre plans start at Rs. 2,000 per month."
+    assert split_sections(text) == [
+        (None, ["Home\nShop\nAbout"]),
+        ("Fibre Plans", ["Our fibre plans start at Rs. 2,000 per month."]),
+    ]
+
+
+def test_small_sections_share_a_chunk():
+    text = "Routers\nWe sell 4G routers.\n\nPhones\nWe sell smartphones."
+    assert split_structured(text) == [("Routers", "Routers\nWe sell 4G routers.\nPhones\nWe sell smartphones.")]
+
+
+def test_oversized_section_repeats_heading_and_respects_the_budget(monkeypatch):
+    monkeypatch.setattr(chunking, "CHUNK_TOKENS", 60)
+    monkeypatch.setattr(chunking, "CHUNK_OVERLAP_TOKENS", 25)
+    paragraphs = [f"Paragraph {i} describes the warranty terms for device model {i}." for i in range(10)]
+    text = "Warranty Terms\n" + "\n\n".join(paragraphs)
+
+    chunks = split_structured(text)
+    assert len(chunks) > 1
+    for heading, body in chunks:
+        assert heading == "Warranty Terms"
+        assert body.startswith("Warranty Terms\n")
+        assert token_count(body) <= 60
+    # Every paragraph survives, and consecutive chunks overlap
+    joined = "\n".join(body for _, body in chunks)
+    assert all(p in joined for p in paragraphs)
+    assert chunks[1][1].split("\n")[1] in chunks[0][1]
+
+
+def test_short_posts_are_kept_whole():
+    post = Document(page_content="New offer!\nDouble data this weekend.", metadata={"type": "post", "source": "fb"})
+    assert split_document(post) == [post]
+
+
+def test_chunks_inherit_metadata_and_record_the_section():
+    page = Document(page_content="Delivery\nOrders are delivered within 3 days.", metadata={"source": "web"})
+    [chunk] = split_document(page)
+    assert chunk.metadata == {"source": "web", "section": "Delivery"}
+
+
+def test_truncate_to_tokens():
+    text = "one two three four five six"
+    assert token_count(truncate_to_tokens(text, 3)) <= 3
+    assert text.startswith(truncate_to_tokens(text, 3))
+    assert truncate_to_tokens(text, 100) == text
+    assert truncate_to_tokens(text, 0) == ""
@@ -0,0 +1,53 @@
+from src.api.services.chunking import token_count
+from src.api.services.context_packer import TRUNCATION_MARK, is_no_data, pack_context
+
+CHUNKS = "\n\n".join(f"Chunk {i}: " + "fibre plan details " * 20 for i in range(6))
+
+
+def test_steps_are_rendered_compactly():
+    steps = [
+        {"tool": "graph_db", "result": "name: Router | price: Rs. 9,990.00"},
+        {"type": "order_form", "message": "Please fill in the form", "prefill_product": "Router"},
+    ]
+    assert pack_context(steps, budget=1000) == (
+        "[graph_db]\nname: Router | price: Rs. 9,990.00\n\n"
+        "[order_form]\nPlease fill in the form (product: Router)"
+    )
+
+
+def test_repeated_results_are_kept_once():
+    steps = [{"tool": "vector_db", "result": "same chunk"}, {"tool": "vector_db", "result": "same chunk"}]
+    assert pack_context(steps, budget=1000) == "[vector_db]\nsame chunk"
+
+
+def test_trailing_chunks_are_dropped_to_fit():
+    context = pack_context([{"tool": "vector_db", "result": CHUNKS}], budget=200)
+    assert token_count(context) <= 200
+    assert "Chunk 0" in context and "Chunk 5" not in context
+
+
+def test_no_data_notes_go_before_data():
+    steps = [
+        {"tool": "graph_db", "result": "No result found"},
+        {"tool": "vector_db", "result": CHUNKS},
+    ]
+    context = pack_context(steps, budget=200)
+    assert "[graph_db]" not in context
+    assert context.startswith("[vector_db]\nChunk 0")
+
+
+def test_essential_steps_survive_and_single_blocks_are_truncated():
+    steps = [
+        {"type": "auth_error", "message": "Please log in to place an order."},
+        {"tool": "vector_db", "result": "warranty terms " * 300},
+    ]
+    context = pack_context(steps, budget=100)
+    assert token_count(context) <= 100
+    assert "[auth_error]\nPlease log in to place an order." in context
+    assert context.endswith(TRUNCATION_MARK)
+
+
+def test_is_no_data():
+    assert is_no_data("") and is_no_data("[]")
+    assert is_no_data("No relevant information found in the vector database.")
+    assert not is_no_data("name: Router")
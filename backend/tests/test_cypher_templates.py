@@ -0,0 +1,43 @@
+from src.api.services.cypher_templates import content_words, match_categories, parse_price_range, plan_query
+
+CATEGORIES = ["4G, 3G Routers", "ADSL Routers", "Mobile Phones & Accessories", "Smart Watches", "Wi-Fi Mesh"]
+
+
+def test_category_question():
+    plan = plan_query("Show me your routers under 20k", CATEGORIES)
+    assert plan.intent == "category"
+    assert plan.params == {"categories": ["4G, 3G Routers", "ADSL Routers"], "min_price": None, "max_price": 20000.0}
+    assert "c.name IN $categories" in plan.cypher
+
+
+def test_product_name_question():
+    plan = plan_query("What is the price of the Huawei B535 router?", CATEGORIES)
+    assert plan.intent == "product_name"
+    assert plan.params["term"] == "+huawei~1 +b535~1 +router~1"
+    assert "$min_score" in plan.cypher
+
+
+def test_broad_question_with_ordering():
+    plan = plan_query("What is your cheapest product?", CATEGORIES)
+    assert plan.intent == "broad"
+    assert "ORDER BY p.price ASC" in plan.cypher
+
+
+def test_price_range_without_product_words():
+    plan = plan_query("anything between 5,000 and 10,000?", CATEGORIES)
+    assert plan.intent == "broad"
+    assert (plan.params["min_price"], plan.params["max_price"]) == (5000.0, 10000.0)
+
+
+def test_questions_left_to_the_llm():
+    assert plan_query("What is the warranty on routers?", CATEGORIES) is None
+    assert plan_query("Do you deliver to Kandy?", CATEGORIES) is None
+    assert plan_query("Which router is best for gaming", CATEGORIES) is None
+    assert plan_query("hello", CATEGORIES) is None
+
+
+def test_helpers():
+    assert content_words("cheapest smart watches under rs. 15,000") == ["smart", "watch"]
+    assert match_categories(["wifi", "mesh"], CATEGORIES) == ["Wi-Fi Mesh"]
+    assert match_categories(["huawei", "router"], CATEGORIES) == []
+    assert parse_price_range("over 2k") == {"min_price": 2000.0, "max_price": None}
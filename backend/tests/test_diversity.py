@@ -0,0 +1,35 @@
+import numpy as np
+
+from src.api.services.diversity import diversity_settings, mmr_select
+
+
+def test_near_duplicates_are_dropped():
+    vectors = np.array([[1.0, 0.0], [0.999, 0.01], [0.0, 1.0]])
+    assert mmr_select(vectors, k=3, lambda_mult=0.7, duplicate_threshold=0.95) == [0, 2]
+
+
+def test_relevance_only_keeps_retrieval_order():
+    vectors = np.array([[1.0, 0.0], [0.8, 0.6], [0.6, 0.8], [0.0, 1.0]])
+    assert mmr_select(vectors, k=4, lambda_mult=1.0, duplicate_threshold=1.01) == [0, 1, 2, 3]
+
+
+def test_diversity_promotes_a_different_candidate():
+    # Second candidate repeats the first; the third covers something else
+    vectors = np.array([[1.0, 0.0], [0.9, 0.1], [0.0, 1.0]])
+    assert mmr_select(vectors, k=2, lambda_mult=0.5, duplicate_threshold=1.01) == [0, 2]
+
+
+def test_relevance_scores_override_retrieval_order():
+    vectors = np.eye(3)
+    relevance = np.array([0.2, 0.9, 0.5])
+    assert mmr_select(vectors, k=3, lambda_mult=0.7, relevance=relevance) == [1, 2, 0]
+
+
+def test_zero_vectors_and_empty_input():
+    assert mmr_select(np.zeros((0, 4)), k=3) == []
+    assert mmr_select(np.zeros((2, 4)), k=1) == [0]
+
+
+def test_diversity_settings():
+    assert diversity_settings("dedup")[0] == 1.0
+    assert diversity_settings("none") is None
@@ -0,0 +1,38 @@
+from langchain_core.documents import Document
+
+from src.api.services.lexical_index import reciprocal_rank_fusion
+
+
+def doc(doc_id: str) -> Document:
+    return Document(page_content=f"text of {doc_id}", id=doc_id)
+
+
+def ids(docs):
+    return [d.id for d in docs]
+
+
+def test_documents_found_by_both_retrievers_rank_first():
+    dense = [doc("a"), doc("b"), doc("c")]
+    lexical = [doc("c"), doc("d"), doc("a")]
+    assert ids(reciprocal_rank_fusion([dense, lexical], k=4)) == ["a", "c", "b", "d"]
+
+
+def test_result_is_cut_to_k():
+    assert ids(reciprocal_rank_fusion([[doc("a"), doc("b"), doc("c")]], k=2)) == ["a", "b"]
+
+
+def test_single_list_keeps_its_order():
+    ranked = [doc(x) for x in "qwerty"]
+    assert ids(reciprocal_rank_fusion([ranked], k=10)) == list("qwerty")
+
+
+def test_documents_without_id_are_keyed_by_content():
+    first = Document(page_content="same chunk")
+    second = Document(page_content="same chunk")
+    fused = reciprocal_rank_fusion([[first], [Document(page_content="other"), second]], k=5)
+    assert [d.page_content for d in fused] == ["same chunk", "other"]
+    assert fused[0] is first
+
+
+def test_empty_input():
+    assert reciprocal_rank_fusion([[], []], k=3) == []
@@ -0,0 +1,88 @@
+import pytest
+
+pytest.importorskip("neo4j")
+pytest.importorskip("langchain_neo4j")
+
+from neo4j.exceptions import ClientError, ServiceUnavailable
+
+from src.api.services.neo4j_service import Neo4jIngestor, extract_cypher, validate_cypher
+
+
+class FakeSession:
+    """Fails any write batch containing a bad SKU, like a constraint violation would."""
+
+    def __init__(self, bad_skus=(), error=None):
+        self.bad_skus = set(bad_skus)
+        self.error = error
+        self.batches = []
+
+    def execute_write(self, fn, rows):
+        if self.error:
+            raise self.error
+        if any(row["sku"] in self.bad_skus for row in rows):
+            raise ClientError("bad row")
+        self.batches.append([row["sku"] for row in rows])
+
+
+def rows(n):
+    return [{"sku": f"SKU{i}"} for i in range(n)]
+
+
+@pytest.fixture
+def ingestor():
+    return Neo4jIngestor(None, None, None, driver=object())
+
+
+def test_clean_batch_is_one_write(ingestor):
+    session = FakeSession()
+    assert ingestor._write_rows(session, rows(8)) == 8
+    assert len(session.batches) == 1
+
+
+def test_bad_row_only_drops_itself(ingestor):
+    session = FakeSession(bad_skus={"SKU5"})
+    assert ingestor._write_rows(session, rows(8)) == 7
+    written = [sku for batch in session.batches for sku in batch]
+    assert sorted(written) == sorted(f"SKU{i}" for i in range(8) if i != 5)
+    # Bisection: the healthy half is written in one go
+    assert ["SKU0", "SKU1", "SKU2", "SKU3"] in session.batches
+
+
+def test_every_row_bad(ingestor):
+    assert ingestor._write_rows(FakeSession(bad_skus={"SKU0", "SKU1", "SKU2"}), rows(3)) == 0
+
+
+def test_lost_connection_aborts_instead_of_bisecting(ingestor):
+    with pytest.raises(ServiceUnavailable):
+        ingestor._write_rows(FakeSession(error=ServiceUnavailable("down")), rows(8))
+
+
+def test_read_only_queries_pass():
+    cypher = "MATCH (p:Product) WHERE p.name CONTAINS 'Router' RETURN p.name LIMIT 5"
+    assert validate_cypher(cypher) == cypher
+    fulltext = 'CALL db.index.fulltext.queryNodes("product_name_index", "router") YIELD node RETURN node.name'
+    assert validate_cypher(fulltext) == fulltext
+
+
+@pytest.mark.parametrize("cypher", [
+    "MATCH (n) DETACH DELETE n",
+    "MATCH (p:Product) SET p.price = 0",
+    "merge (c:Category {name: 'x'})",
+    "LOAD CSV FROM 'file:///x.csv' AS row RETURN row",
+    "CALL apoc.periodic.iterate('MATCH (n) RETURN n', 'DELETE n', {})",
+    "CALL dbms.security.listUsers()",
+    "",
+])
+def test_writes_and_procedures_are_rejected(cypher):
+    with pytest.raises(ValueError):
+        validate_cypher(cypher)
+
+
+def test_write_keywords_inside_strings_are_allowed():
+    cypher = "MATCH (p:Product) WHERE p.name = 'Create Set Delete Combo' RETURN p.name"
+    assert validate_cypher(cypher) == cypher
+
+
+def test_extract_cypher():
+    assert extract_cypher("Here you go:\n```cypher\nMATCH (n) RETURN n\n```") == "MATCH (n) RETURN n"
+    assert extract_cypher("  MATCH (n) RETURN n ") == "MATCH (n) RETURN n"
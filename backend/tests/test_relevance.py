@@ -0,0 +1,36 @@
+import numpy as np
+
+from src.api.services.relevance import above_min_score, adaptive_k, cosine_scores
+
+
+def test_cut_at_the_first_large_gap():
+    assert adaptive_k([0.82, 0.80, 0.45, 0.44], k=4, dropoff=0.15, min_k=1) == 2
+
+
+def test_one_strong_match_is_not_padded():
+    assert adaptive_k([0.9, 0.5, 0.48], k=3, dropoff=0.15, min_k=1) == 1
+
+
+def test_gaps_before_min_k_are_ignored():
+    assert adaptive_k([0.9, 0.5, 0.48], k=3, dropoff=0.15, min_k=2) == 3
+    assert adaptive_k([0.9, 0.5, 0.1], k=3, dropoff=0.15, min_k=2) == 2
+
+
+def test_no_gap_keeps_up_to_k():
+    assert adaptive_k([0.7, 0.65, 0.6, 0.55, 0.5], k=3, dropoff=0.15, min_k=1) == 3
+    assert adaptive_k([0.7, 0.65], k=5, dropoff=0.15, min_k=1) == 2
+
+
+def test_scores_are_sorted_first():
+    assert adaptive_k([0.45, 0.82, 0.80], k=3, dropoff=0.15, min_k=1) == 2
+
+
+def test_empty_scores():
+    assert adaptive_k([], k=4) == 0
+
+
+def test_cosine_scores_and_min_score():
+    vectors = np.array([[1.0, 0.0], [0.0, 2.0], [0.0, 0.0]], dtype=np.float32)
+    scores = cosine_scores([3.0, 0.0], vectors)
+    assert np.allclose(scores, [1.0, 0.0, 0.0])
+    assert above_min_score(scores, min_score=0.2) == [0]
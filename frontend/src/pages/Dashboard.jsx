@@ -18,6 +18,7 @@ export default function Dashboard() {
   const [statusMsg, setStatusMsg] = useState({ text: '', type: '' });
   const [apiResult, setApiResult] = useState(null);
   const [loadingAction, setLoadingAction] = useState(null);
+  const [activeJob, setActiveJob] = useState(null);
 
   // --- Helpers ---
   const authFetch = async (endpoint, options = {}) => {
@@ -85,6 +86,29 @@ export default function Dashboard() {
     setLoadingAction(null);
   };
 
+  // Ingestion/clearing endpoints return a job id; poll it until the job finishes
+  const describeJob = (job) => {
+    let text = job.message || job.status;
+    if (job.percent != null) text += ` - ${job.percent}%`;
+    if (job.eta_seconds != null) text += ` (about ${Math.ceil(job.eta_seconds)}s left)`;
+    return text;
+  };
+
+  const pollJob = async (jobId) => {
+    while (true) {
+      await new Promise((resolve) => setTimeout(resolve, 1500));
+      const res = await authFetch(`/admin/jobs/${jobId}`);
+      if (!res || !res.ok) return null;
+      const job = await res.json();
+      setApiResult(job);
+      if (job.status === 'queued' || job.status === 'running') {
+        setStatusMsg({ text: describeJob(job), type: 'success' });
+      } else {
+        return job;
+      }
+    }
+  };
+
   const triggerAction = async (endpoint, actionId, method = 'POST') => {
     setLoadingAction(actionId);
     setStatusMsg({ text: 'Processing...', type: 'success' });
@@ -94,13 +118,36 @@ export default function Dashboard() {
     if (res && res.ok) {
       const data = await res.json();
       setApiResult(data);
-      setStatusMsg({ text: 'Action completed!', type: 'success' });
+      if (data.job_id) {
+        setActiveJob(data.job_id);
+        const job = await pollJob(data.job_id);
+        setActiveJob(null);
+        if (job && job.status === 'succeeded') {
+          setStatusMsg({ text: 'Action completed!', type: 'success' });
+        } else if (job && job.status === 'cancelled') {
+          setStatusMsg({ text: 'Action cancelled', type: 'error' });
+        } else {
+          setStatusMsg({ text: `Action failed${job && job.error ? `: ${job.error}` : ''}`, type: 'error' });
+        }
+      } else {
+        setStatusMsg({ text: 'Action completed!', type: 'success' });
+      }
+    } else if (res && res.status === 409) {
+      setStatusMsg({ text: 'This action or a conflicting one is already running', type: 'error' });
     } else {
       setStatusMsg({ text: 'Action failed', type: 'error' });
     }
     setLoadingAction(null);
   };
 
+  const cancelJob = async () => {
+    if (!activeJob) return;
+    const res = await authFetch(`/admin/jobs/${activeJob}/cancel`, { method: 'POST' });
+    if (res && res.status === 409) {
+      setStatusMsg({ text: 'This step cannot be cancelled; wait for it to finish', type: 'error' });
+    }
+  };
+
   useEffect(() => { loadConfig(); }, []);
 
   const updateUrlList = (setter, list, index, value) => {
@@ -117,8 +164,11 @@ export default function Dashboard() {
        
        {/* Status Message Area */}
        {statusMsg.text && (
-        <div className={`p-4 rounded-md ${statusMsg.type === 'error' ? 'bg-red-100 text-red-800' : 'bg-green-100 text-green-800'}`}>
-            {statusMsg.text}
+        <div className={`p-4 rounded-md flex justify-between items-center ${statusMsg.type === 'error' ? 'bg-red-100 text-red-800' : 'bg-green-100 text-green-800'}`}>
+            <span>{statusMsg.text}</span>
+            {activeJob && apiResult?.cancellable !== false && (
+                <button onClick={cancelJob} className="text-sm font-medium underline hover:no-underline">Cancel</button>
+            )}
         </div>
        )}
 